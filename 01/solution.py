@@ -1,20 +1,321 @@
 #!/usr/bin/env python
+import bisect
+import collections
+import contextlib
+import itertools
+import math
+import operator
+import os
+import sys
+from array import array
+from typing import Any, Dict, Generator, Iterable, Iterator, List, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aoc import external_sort, memo, reader
+
+
+def fits_int64(bound: int) -> bool:
+    return bound <= reader.INT64_MAX
+
+
+def get_max_abs(values: Any) -> int:
+    return max(-int(values.min()), int(values.max()))
+
+
+# Fewest values of the domain in a block of the tracker, a block is split when it gets twice as large
+MIN_BLOCK_SIZE = 16
+
+
+def get_block_size(size: int) -> int:
+    # An update goes over the intervals of one block then over the blocks after it, so both are kept
+    # around the square root of the number of values of the domain. An interval costs a few times more
+    # than a block, hence the smaller blocks
+    return max(MIN_BLOCK_SIZE, math.isqrt(size) // 2)
+
+
+class Block:
+    __slots__ = ("values", "diffs", "weights", "shift", "weight_by_diff", "weight", "negative_weight", "cost")
+
+    def __init__(self, values: List[int], diffs: List[int], weights: List[int], shift: int = 0) -> None:
+        # Each value starts an interval of the domain, up to the next value, of the given weight (its
+        # length) on which the counts of the two lists differ by diff + shift
+        self.values = values
+        self.diffs = diffs
+        self.weights = weights
+        self.shift = shift
+        self.weight_by_diff: Dict[int, int] = {}
+        self.weight = 0
+        self.negative_weight = 0
+        # Sum of |diff + shift| * weight over the intervals
+        self.cost = 0
+        for diff, weight in zip(diffs, weights):
+            self._add_weight(diff, weight)
+
+    def _add_weight(self, diff: int, weight: int) -> int:
+        total = self.weight_by_diff.get(diff, 0) + weight
+        if total != 0:
+            self.weight_by_diff[diff] = total
+        else:
+            self.weight_by_diff.pop(diff, None)
+        self.weight += weight
+        actual = diff + self.shift
+        if actual < 0:
+            self.negative_weight += weight
+        self.cost += abs(actual) * weight
+        return abs(actual) * weight
+
+    def insert(self, idx: int, value: int, diff: int, weight: int) -> int:
+        self.values.insert(idx, value)
+        self.diffs.insert(idx, diff)
+        self.weights.insert(idx, 0)
+        return self.resize(idx, weight)
+
+    def resize(self, idx: int, weight: int) -> int:
+        change = self._add_weight(self.diffs[idx], weight - self.weights[idx])
+        self.weights[idx] = weight
+        return change
+
+    def remove(self, idx: int) -> int:
+        change = self.resize(idx, 0)
+        del self.values[idx], self.diffs[idx], self.weights[idx]
+        return change
+
+    def update_from(self, idx: int, delta: int) -> int:
+        """Add delta to the difference of the intervals from idx to the end of the block."""
+        weight_by_diff, diffs, weights = self.weight_by_diff, self.diffs, self.weights
+        change = 0
+        negative_change = 0
+        for i in range(idx, len(diffs)):
+            diff = diffs[i]
+            diffs[i] = diff + delta
+            weight = weights[i]
+            if weight == 0:
+                continue
+            remaining = weight_by_diff[diff] - weight
+            if remaining != 0:
+                weight_by_diff[diff] = remaining
+            else:
+                del weight_by_diff[diff]
+            weight_by_diff[diff + delta] = weight_by_diff.get(diff + delta, 0) + weight
+            actual = diff + self.shift
+            change += (abs(actual + delta) - abs(actual)) * weight
+            negative_change += ((actual + delta < 0) - (actual < 0)) * weight
+        self.cost += change
+        self.negative_weight += negative_change
+        return change
+
+    def shift_by(self, delta: int) -> int:
+        """Add delta, 1 or -1, to the difference of every interval, in constant time."""
+        cost = self.cost
+        if delta > 0:
+            self.cost += self.weight - 2 * self.negative_weight
+            self.negative_weight -= self.weight_by_diff.get(-1 - self.shift, 0)
+        else:
+            zero_weight = self.weight_by_diff.get(-self.shift, 0)
+            self.cost += 2 * (self.negative_weight + zero_weight) - self.weight
+            self.negative_weight += zero_weight
+        self.shift += delta
+        return self.cost - cost
+
+    def split(self) -> Tuple["Block", "Block"]:
+        half = len(self.values) // 2
+        return (
+            Block(self.values[:half], self.diffs[:half], self.weights[:half], self.shift),
+            Block(self.values[half:], self.diffs[half:], self.weights[half:], self.shift),
+        )
+
+
+class LocationTracker:
+    # For two sorted lists of the same length, the sum of the distances of their pairs is the sum over
+    # the whole domain of |number of left values <= x - number of right values <= x|. Adding a value
+    # changes this difference on the suffix of the domain that starts at the value: the domain is cut
+    # in blocks, updated one interval at a time in the block of the value and at once in the next ones.
+    # The blocks are cut again as the domain grows or shrinks, so that an update costs O(sqrt(size)).
+
+    def __init__(self) -> None:
+        self.blocks: List[Block] = []
+        self.firsts: List[int] = []
+        # Number of values of the domain, and the size of the blocks when they were last cut
+        self.size = 0
+        self.block_size = MIN_BLOCK_SIZE
+        self.left_counts: Dict[int, int] = collections.Counter()
+        self.right_counts: Dict[int, int] = collections.Counter()
+        self.distance = 0
+        self.similarity = 0
+
+    @classmethod
+    def from_pairs(cls, left_list: Iterable[int], right_list: Iterable[int]) -> "LocationTracker":
+        tracker = cls()
+        tracker.left_counts.update(left_list)
+        tracker.right_counts.update(right_list)
+        if sum(tracker.left_counts.values()) != sum(tracker.right_counts.values()):
+            raise ValueError("The lists must have the same length")
+        values = sorted(tracker.left_counts.keys() | tracker.right_counts.keys())
+        diffs = list(
+            itertools.accumulate(tracker.left_counts.get(n, 0) - tracker.right_counts.get(n, 0) for n in values)
+        )
+        weights = [n2 - n1 for n1, n2 in zip(values, values[1:])] + [0] * min(1, len(values))
+        tracker._cut(values, diffs, weights)
+        tracker.distance = sum(block.cost for block in tracker.blocks)
+        tracker.similarity = sum(n * count * tracker.right_counts[n] for n, count in tracker.left_counts.items())
+        return tracker
+
+    def __len__(self) -> int:
+        return sum(self.left_counts.values())
+
+    def _cut(self, values: List[int], diffs: List[int], weights: List[int]) -> None:
+        self.size = len(values)
+        self.block_size = get_block_size(self.size)
+        self.blocks = []
+        self.firsts = []
+        for start in range(0, self.size, self.block_size):
+            end = start + self.block_size
+            self.blocks.append(Block(values[start:end], diffs[start:end], weights[start:end]))
+            self.firsts.append(values[start])
+
+    def _rebalance(self) -> None:
+        # Cutting again takes O(size), it only happens once the block size to aim for has doubled or
+        # halved, or once splits and removals have left twice as many blocks as needed
+        block_size = get_block_size(self.size)
+        if (
+            block_size <= 2 * self.block_size
+            and self.block_size <= 2 * block_size
+            and len(self.blocks) <= 2 * (self.size // self.block_size + 1)
+        ):
+            return
+        values = [value for block in self.blocks for value in block.values]
+        diffs = [diff + block.shift for block in self.blocks for diff in block.diffs]
+        weights = [weight for block in self.blocks for weight in block.weights]
+        self._cut(values, diffs, weights)
+
+    def _locate(self, value: int) -> Tuple[int, int]:
+        """Block and index of the greatest value of the domain not above the value, -1 if there is none."""
+        block_idx = bisect.bisect_right(self.firsts, value) - 1
+        if block_idx < 0:
+            return -1, -1
+        return block_idx, bisect.bisect_right(self.blocks[block_idx].values, value) - 1
+
+    def _insert(self, value: int) -> None:
+        self.size += 1
+        block_idx, idx = self._locate(value)
+        if block_idx < 0:
+            # Before all the values the lists have the same number of values: none
+            if len(self.blocks) == 0:
+                self.blocks.append(Block([value], [0], [0]))
+                self.firsts.append(value)
+                return
+            block_idx = 0
+            block = self.blocks[0]
+            self.distance += block.insert(0, value, -block.shift, block.values[0] - value)
+            self.firsts[0] = value
+        else:
+            block = self.blocks[block_idx]
+            is_last = block_idx == len(self.blocks) - 1 and idx == len(block.values) - 1
+            weight = value - block.values[idx]
+            # The last interval goes on forever with a difference of 0, it is given no weight
+            new_weight = 0 if is_last else block.weights[idx] - weight
+            self.distance += block.resize(idx, weight)
+            self.distance += block.insert(idx + 1, value, block.diffs[idx], new_weight)
+        if len(block.values) >= 2 * self.block_size:
+            head, tail = block.split()
+            self.blocks[block_idx : block_idx + 1] = [head, tail]
+            self.firsts.insert(block_idx + 1, tail.values[0])
+        self._rebalance()
+
+    def _discard(self, value: int) -> None:
+        # No list has the value anymore: its interval has the same difference as the previous one
+        self.size -= 1
+        block_idx, idx = self._locate(value)
+        block = self.blocks[block_idx]
+        is_last = block_idx == len(self.blocks) - 1 and idx == len(block.values) - 1
+        if idx > 0 or block_idx > 0:
+            previous_block = block if idx > 0 else self.blocks[block_idx - 1]
+            previous_idx = idx - 1 if idx > 0 else len(previous_block.values) - 1
+            weight = 0 if is_last else previous_block.weights[previous_idx] + block.weights[idx]
+            self.distance += previous_block.resize(previous_idx, weight)
+        self.distance += block.remove(idx)
+        if len(block.values) == 0:
+            del self.blocks[block_idx], self.firsts[block_idx]
+        elif idx == 0:
+            self.firsts[block_idx] = block.values[0]
+        self._rebalance()
+
+    def _update_from(self, value: int, delta: int) -> None:
+        block_idx, idx = self._locate(value)
+        self.distance += self.blocks[block_idx].update_from(idx, delta)
+        for block in self.blocks[block_idx + 1 :]:
+            self.distance += block.shift_by(delta)
+
+    def add_pair(self, left: int, right: int) -> None:
+        for value in {left, right}:
+            if self.left_counts[value] == 0 and self.right_counts[value] == 0:
+                self._insert(value)
+        self.similarity += left * self.right_counts[left]
+        self.left_counts[left] += 1
+        self.similarity += right * self.left_counts[right]
+        self.right_counts[right] += 1
+        self._update_from(left, 1)
+        self._update_from(right, -1)
+
+    def remove_pair(self, left: int, right: int) -> None:
+        if self.left_counts.get(left, 0) == 0 or self.right_counts.get(right, 0) == 0:
+            raise KeyError(f"No pair ({left}, {right}) to remove")
+        self._update_from(left, -1)
+        self._update_from(right, 1)
+        self.left_counts[left] -= 1
+        self.similarity -= left * self.right_counts[left]
+        self.right_counts[right] -= 1
+        self.similarity -= right * self.left_counts[right]
+        for value in {left, right}:
+            if self.left_counts[value] == 0 and self.right_counts[value] == 0:
+                self._discard(value)
+                self.left_counts.pop(value, None)
+                self.right_counts.pop(value, None)
+
 
 class Solver:
 
     def __init__(self):
         self.left_list = []
         self.right_list = []
+        # Both columns as NumPy arrays instead of the lists, for large inputs when NumPy is installed
+        self.columns: Tuple[Any, Any] | None = None
 
     def parse(self, path: str) -> None:
-        with open(path, "r") as hand:
-            for line in hand:
-                line = line.strip()
-                n1, n2 = tuple(map(int, line.split()))
-                self.left_list.append(n1)
-                self.right_list.append(n2)
+        values = reader.read_int_rows(path, 2)
+        numpy = reader.get_numpy(len(values))
+        if numpy is not None and isinstance(values, array) and len(values) > 0:
+            pairs = numpy.frombuffer(values, dtype=numpy.int64).reshape(-1, 2)
+            self.columns = numpy.ascontiguousarray(pairs[:, 0]), numpy.ascontiguousarray(pairs[:, 1])
+            return
+        self.left_list = list(values[0::2])
+        self.right_list = list(values[1::2])
+
+    @memo.memoized
+    def _sort_columns(self) -> Tuple[Any, Any]:
+        left, right = self.columns
+        left.sort()
+        right.sort()
+        return left, right
+
+    def _get_distance_array(self) -> int:
+        left, right = self._sort_columns()
+        if fits_int64(2 * max(get_max_abs(left), get_max_abs(right)) * len(left)):
+            return int(abs(left - right).sum())
+        # The differences or their sum could overflow 64 bits
+        return sum(map(abs, map(operator.sub, left.tolist(), right.tolist())))
+
+    def _get_similarity_array(self) -> int:
+        left, right = self._sort_columns()
+        occurrences = right.searchsorted(left, side="right") - right.searchsorted(left, side="left")
+        if fits_int64(get_max_abs(left) * int(occurrences.max()) * len(left)):
+            return int((left * occurrences).sum())
+        return sum(map(operator.mul, left.tolist(), occurrences.tolist()))
 
     def solve1(self) -> int:
+        if self.columns is not None:
+            return self._get_distance_array()
         self.left_list.sort()
         self.right_list.sort()
         total = 0
@@ -23,6 +324,8 @@ class Solver:
         return total
 
     def solve2(self) -> int:
+        if self.columns is not None:
+            return self._get_similarity_array()
         occurrences = {}
         for value in self.right_list:
             occurrences[value] = occurrences.get(value, 0) + 1
@@ -31,6 +334,45 @@ class Solver:
             score += n * occurrences.get(n, 0)
         return score
 
+    def get_tracker(self) -> LocationTracker:
+        if self.columns is not None:
+            return LocationTracker.from_pairs(*(column.tolist() for column in self.columns))
+        return LocationTracker.from_pairs(self.left_list, self.right_list)
+
+    @contextlib.contextmanager
+    def _sort_external(self, path: str) -> Generator[Tuple[Iterator[int], Iterator[int]], None, None]:
+        # Half of the memory budget for each column
+        budget = external_sort.get_budget() // 2
+        with external_sort.ExternalSorter(budget) as left, external_sort.ExternalSorter(budget) as right:
+            for block in reader.iter_blocks(path):
+                values = reader.parse_ints(block)
+                if len(values) % 2 != 0:
+                    raise ValueError(f"Expected 2 integers per line in {path}")
+                left.extend(values[0::2])
+                right.extend(values[1::2])
+            yield left.merge(), right.merge()
+
+    def stream1(self, path: str) -> int:
+        with self._sort_external(path) as (left, right):
+            total = 0
+            for n1, n2 in zip(left, right):
+                total += abs(n1 - n2)
+            return total
+
+    def stream2(self, path: str) -> int:
+        """Similarity score with at most the memory budget of the sort, whatever the number of distinct values."""
+        with self._sort_external(path) as (left, right):
+            # Both columns are sorted, the occurrences of each value are counted while walking them together
+            right_groups = ((n, sum(1 for _ in group)) for n, group in itertools.groupby(right))
+            right_value, right_count = next(right_groups, (None, 0))
+            score = 0
+            for n, group in itertools.groupby(left):
+                while right_value is not None and right_value < n:
+                    right_value, right_count = next(right_groups, (None, 0))
+                if right_value == n:
+                    score += n * sum(1 for _ in group) * right_count
+            return score
+
 
 def main():
     solver = Solver()
@@ -1,5 +1,12 @@
 #!/usr/bin/env python
-from typing import List
+import os
+import sys
+from array import array
+from typing import Any, Iterable, Sequence, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aoc import reader
 
 
 def sgn(a: int) -> int:
@@ -12,14 +19,27 @@ class Solver:
 
     def __init__(self):
         self.data = list()
+        # All the levels and the offsets of the reports in them as NumPy arrays, instead of the
+        # tuples, for large inputs when NumPy is installed
+        self.batch: Tuple[Any, Any] | None = None
 
     def parse(self, path: str) -> None:
-        with open(path) as hand:
-            for line in hand:
-                line = line.strip()
-                self.data.append([int(el) for el in line.split()])
+        values, offsets = reader.read_ragged_ints(path)
+        numpy = reader.get_numpy(len(values))
+        if numpy is not None and isinstance(values, array) and len(values) > 0:
+            np_values = numpy.frombuffer(values, dtype=numpy.int64)
+            # The steps between the levels must fit in 64 bits
+            if max(-int(np_values.min()), int(np_values.max())) < 1 << 62:
+                self.batch = np_values, numpy.frombuffer(offsets, dtype=numpy.int64)
+                return
+        values, offsets = list(values), list(offsets)
+        # Tuples of integers are not followed by the garbage collector, unlike lists
+        self.data = [tuple(values[start:end]) for start, end in zip(offsets, offsets[1:])]
 
-    def is_safe(self, report: List[int]) -> bool:
+    def is_safe(self, report: Sequence[int]) -> bool:
+        # A single level has no step that could be too large or change direction
+        if len(report) < 2:
+            return True
         dir = sgn(report[1] - report[0])
         if dir == 0:
             return False
@@ -31,24 +51,122 @@ class Solver:
                 break
         return is_safe
 
-    def solve1(self) -> int:
+    def _count_safe(self, reports: Iterable[Sequence[int]]) -> int:
         safe = 0
-        for report in self.data:
+        for report in reports:
             if self.is_safe(report):
                 safe += 1
         return safe
 
-    def solve2(self) -> int:
+    def _is_monotonic(self, report: Sequence[int], direction: int, skip: int = -1) -> bool:
+        # Whether the levels, without the one at skip, all move by 1 to 3 in the direction
+        previous = None
+        for i, level in enumerate(report):
+            if i == skip:
+                continue
+            if previous is not None and not 1 <= (level - previous) * direction <= 3:
+                return False
+            previous = level
+        return True
+
+    def _find_violation(self, report: Sequence[int], direction: int) -> int:
+        for i in range(len(report) - 1):
+            if not 1 <= (report[i + 1] - report[i]) * direction <= 3:
+                return i
+        return -1
+
+    def is_safe_with_dampener(self, report: Sequence[int]) -> bool:
+        for direction in (1, -1):
+            violation = self._find_violation(report, direction)
+            if violation < 0:
+                return True
+            # Only removing one of the two levels of the first bad step can fix it
+            if self._is_monotonic(report, direction, skip=violation):
+                return True
+            if self._is_monotonic(report, direction, skip=violation + 1):
+                return True
+        return False
+
+    def get_min_removals(self, report: Sequence[int], direction: int, limit: int) -> int:
+        """Fewest levels to remove for the report to move by 1 to 3 in the direction, limit + 1 past the limit."""
+        n = len(report)
+        # removals[j]: fewest levels removed before j when j is kept, the previous kept level is at most
+        # limit + 1 levels before, otherwise more than limit levels were removed in between
+        removals = []
+        for j in range(n):
+            best = j
+            for i in range(max(0, j - limit - 1), j):
+                if 1 <= (report[j] - report[i]) * direction <= 3:
+                    best = min(best, removals[i] + j - i - 1)
+            removals.append(best)
+        fewest = min((removals[j] + n - 1 - j for j in range(n)), default=0)
+        return min(fewest, limit + 1)
+
+    def is_safe_with_removals(self, report: Sequence[int], removals: int) -> bool:
+        return any(self.get_min_removals(report, direction, removals) <= removals for direction in (1, -1))
+
+    def _count_safe_with_dampener(self, reports: Iterable[Sequence[int]]) -> int:
         safe = 0
-        for report in self.data:
-            for i in range(len(report)):
-                new_report = [el for el in report]
-                del new_report[i]
-                if self.is_safe(new_report):
-                    safe += 1
-                    break
+        for report in reports:
+            if self.is_safe_with_dampener(report):
+                safe += 1
         return safe
 
+    def _count_safe_batch(self, numpy: Any, dampener: bool = False) -> int:
+        values, offsets = self.batch
+        starts, ends = offsets[:-1], offsets[1:]
+        safe = numpy.zeros(len(starts), dtype=bool)
+        for direction in (1, -1):
+            # Step i goes from level i to level i + 1, the steps of a report are from its start to its end - 2
+            steps = numpy.diff(values) * direction
+            bad = (steps < 1) | (steps > 3)
+            # The steps from the last level of a report to the first level of the next one do not count
+            bad[ends[:-1] - 1] = False
+            bad_before = numpy.concatenate(([0], numpy.cumsum(bad)))
+            n_bad = bad_before[ends - 1] - bad_before[starts]
+            safe |= n_bad == 0
+            if not dampener:
+                continue
+            # Only removing one of the two levels of the first bad step can fix it
+            has_bad = n_bad > 0
+            report_starts, report_ends, report_bad = starts[has_bad], ends[has_bad], n_bad[has_bad]
+            bad_steps = numpy.flatnonzero(bad)
+            first_bad = bad_steps[numpy.searchsorted(bad_steps, report_starts)]
+            fixed = numpy.zeros(len(report_starts), dtype=bool)
+            for skip in (first_bad, first_bad + 1):
+                # Removing the level removes the steps before and after it, and joins their ends
+                has_before = skip - 1 >= report_starts
+                has_after = skip <= report_ends - 2
+                remaining = report_bad.copy()
+                remaining -= has_before & bad[numpy.maximum(skip - 1, 0)]
+                remaining -= has_after & bad[numpy.minimum(skip, len(bad) - 1)]
+                joined = (values[numpy.minimum(skip + 1, len(values) - 1)] - values[skip - 1]) * direction
+                joined_ok = ~(has_before & has_after) | ((joined >= 1) & (joined <= 3))
+                fixed |= (remaining == 0) & joined_ok
+            safe[has_bad] |= fixed
+        return int(safe.sum())
+
+    def _get_numpy(self) -> Any:
+        # The batch was made with the module given by the reader for the same size, which is not kept
+        # on the solver as its state is pickled by the parse cache
+        return reader.get_numpy(len(self.batch[0]))
+
+    def solve1(self) -> int:
+        if self.batch is not None:
+            return self._count_safe_batch(self._get_numpy())
+        return self._count_safe(self.data)
+
+    def solve2(self) -> int:
+        if self.batch is not None:
+            return self._count_safe_batch(self._get_numpy(), dampener=True)
+        return self._count_safe_with_dampener(self.data)
+
+    def stream1(self, path: str) -> int:
+        return self._count_safe(reader.iter_ragged_ints(path))
+
+    def stream2(self, path: str) -> int:
+        return self._count_safe_with_dampener(reader.iter_ragged_ints(path))
+
 
 def main():
     solver = Solver()
@@ -1,94 +1,112 @@
 #!/usr/bin/env python
+import concurrent.futures
+import functools
+import itertools
+import os
+import re
+import sys
 from typing import Tuple
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aoc import reader
+
+# A token never contains the start of another one, so the tokens found from any position are the
+# tokens of the whole memory that start after it. The numbers have one to three digits, so a token
+# starting before a position ends at most MAX_TOKEN_LEN - 1 bytes after it
+TOKEN = re.compile(rb"mul\((\d{1,3}),(\d{1,3})\)|do\(\)|don't\(\)")
+MAX_TOKEN_LEN = len(b"mul(999,999)")
+DO = b"do()"
+
+# Files from this size are scanned in parallel, in a few chunks for each worker
+PARALLEL_MIN_SIZE = 1 << 24
+CHUNKS_PER_JOB = 4
+
+# Sum of the multiplications of a chunk when it starts enabled and when it starts disabled, and
+# whether they are enabled at its end, None when it has neither do() nor don't()
+Summary = Tuple[int, int, bool | None]
+
+
+def summarize(memory: bytes, start: int, end: int, conditional: bool = False) -> Summary:
+    """Summary of the tokens starting between start and end, the last one may end after end."""
+    if_enabled = 0
+    if_disabled = 0
+    enabled = None
+    for match in TOKEN.finditer(memory, start, end + MAX_TOKEN_LEN - 1):
+        if match.start() >= end:
+            break
+        first = match.group(1)
+        if first is not None:
+            value = int(first) * int(match.group(2))
+            if enabled is None:
+                if_enabled += value
+            elif enabled:
+                if_enabled += value
+                if_disabled += value
+        elif conditional:
+            enabled = match.group() == DO
+    return if_enabled, if_disabled, enabled
+
+
+def summarize_file(path: str, start: int, end: int, conditional: bool) -> Summary:
+    with reader.map_file(path) as data:
+        return summarize(data, start, end, conditional)
+
+
+def combine(first: Summary, second: Summary) -> Summary:
+    """Summary of two consecutive chunks, the combination is associative."""
+    first_if_enabled, first_if_disabled, first_enabled = first
+    second_if_enabled, second_if_disabled, second_enabled = second
+    after_enabled = first_enabled if first_enabled is not None else True
+    after_disabled = first_enabled if first_enabled is not None else False
+    return (
+        first_if_enabled + (second_if_enabled if after_enabled else second_if_disabled),
+        first_if_disabled + (second_if_enabled if after_disabled else second_if_disabled),
+        second_enabled if second_enabled is not None else first_enabled,
+    )
+
 
 class Solver:
 
     def __init__(self):
-        self.memory = None
+        self.memory = b""
+        self.jobs = os.cpu_count() or 1
 
     def parse(self, path: str) -> None:
-        with open(path) as hand:
-            self.memory = hand.read().strip()
-
-    def _get_number_at(self, idx: int) -> Tuple[int,int] | None:
-        start = idx
-        while idx < len(self.memory):
-            if ord("0") <= ord(self.memory[idx]) <= ord("9"):
-                idx += 1
-            else:
-                break
-        if start == idx:
-            return None
-        else:
-            return int(self.memory[start:idx]), idx
-    def _scan_multiplication_at(self, idx: int) -> Tuple[int,int] | None:
-        if idx + 6 >= len(self.memory):
-            return None
-        if self.memory[idx:idx+4] != "mul(":
-            return None
-        first_num_and_next_idx = self._get_number_at(idx + 4)
-        if first_num_and_next_idx is None:
-            return None
-        first_num, next_idx = first_num_and_next_idx
-        if next_idx >= len(self.memory) or self.memory[next_idx] != ",":
-            return None
-        second_num_and_last_idx = self._get_number_at(next_idx + 1)
-        if next_idx >= len(self.memory) or second_num_and_last_idx is None:
-            return None
-        second_num, last_idx = second_num_and_last_idx
-        if next_idx >= len(self.memory) or self.memory[last_idx] != ")":
-            return None
-        return first_num * second_num, last_idx + 1
+        with reader.map_file(path) as data:
+            self.memory = data[:]
+
+    def _add_multiplications(self, memory: bytes, conditional: bool = False) -> int:
+        if_enabled, _, _ = summarize(memory, 0, len(memory), conditional)
+        return if_enabled
+
+    def _scan_file(self, path: str, conditional: bool = False) -> int:
+        size = os.path.getsize(path)
+        if size < PARALLEL_MIN_SIZE or self.jobs == 1:
+            # The regular expression runs over the mapped file, which is never copied
+            with reader.map_file(path) as data:
+                return self._add_multiplications(data, conditional)
+        chunk_size = -(-size // (self.jobs * CHUNKS_PER_JOB))
+        starts = range(0, size, chunk_size)
+        ends = [min(start + chunk_size, size) for start in starts]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            summaries = executor.map(
+                summarize_file, itertools.repeat(path), starts, ends, itertools.repeat(conditional)
+            )
+            if_enabled, _, _ = functools.reduce(combine, summaries)
+        return if_enabled
 
     def solve1(self) -> int:
-        idx = 0
-        result = 0
-        while idx < len(self.memory):
-            if self.memory[idx] != "m":
-                idx += 1
-                continue
-            value_and_next_idx = self._scan_multiplication_at(idx)
-            if value_and_next_idx is None:
-                idx += 1
-                continue
-            value, idx = value_and_next_idx
-            result += value
-        return result
-
-    def _scan_do_dont(self, idx) -> Tuple[bool, int] | None:
-        if self.memory[idx:idx+4] == "do()":
-            return True, idx + 4
-        elif self.memory[idx:idx+7] == "don't()":
-            return False, idx+7
-        else:
-            return None
+        return self._add_multiplications(self.memory)
 
     def solve2(self) -> int:
-        idx = 0
-        result = 0
-        multiplication_enabled = True
-        while idx < len(self.memory):
-            if self.memory[idx] == "d":
-                do_and_next_idx = self._scan_do_dont(idx)
-                if do_and_next_idx is None:
-                    idx += 1
-                    continue
-                do, idx = do_and_next_idx
-                if do:
-                    multiplication_enabled = True
-                else:
-                    multiplication_enabled = False
-            if self.memory[idx] == "m" and multiplication_enabled:
-                value_and_next_idx = self._scan_multiplication_at(idx)
-                if value_and_next_idx is None:
-                    idx += 1
-                    continue
-                value, idx = value_and_next_idx
-                result += value
-            else:
-                idx += 1
-        return result
+        return self._add_multiplications(self.memory, conditional=True)
+
+    def stream1(self, path: str) -> int:
+        return self._scan_file(path)
+
+    def stream2(self, path: str) -> int:
+        return self._scan_file(path, conditional=True)
 
 
 def main():
@@ -1,5 +1,13 @@
 #!/usr/bin/env python
-from typing import List, Iterable
+import collections
+import os
+import sys
+from typing import Any, Deque, Dict, Generator, Iterable, List, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aoc import aho_corasick, reader
+from aoc.grid import Grid
 
 DIRECTIONS = [
     (1, 0), (-1, 0),
@@ -15,84 +23,213 @@ DIAGONALS = [
     (-1, 1),
 ]
 
-
-def vector_sum(v: Iterable[int], d: Iterable[int]) -> List[int]:
-    res = []
-    for x, delta in zip(v, d):
-        res.append(x + delta)
-    return res
+# One direction of each line, the words are also searched backwards along them
+LINES = [(1, 0), (0, 1), (1, 1), (-1, 1)]
+XMAS = b"XMAS"
+M, A, S = ord("M"), ord("A"), ord("S")
+
+# Position of the first letter of a word, and direction towards the next letters
+Match = Tuple[int, int, int, int]
+# For each letter, the columns of a row holding it, as the bytes of an integer set to 1
+Masks = Dict[int, int]
+
+
+def get_table(letter: int) -> bytes:
+    """Translation table of a row into the bytes of its mask for the letter."""
+    return bytes(int(ch == letter) for ch in range(256))
+
+
+def shift_columns(mask: int, shift: int) -> int:
+    """The mask of the columns `shift` further right, as seen from each column."""
+    return mask >> (8 * shift) if shift >= 0 else mask << (-8 * shift)
+
+
+def count_word_ending(window: Deque[Masks], word: bytes) -> int:
+    """Occurrences of the word in the 8 directions whose lowest letter is in the last row of the window."""
+    span = len(word) - 1
+    total = 0
+    for dx, dy in LINES:
+        if dy != 0 and len(window) <= span:
+            continue
+        for letters in (word, word[::-1]):
+            found = -1
+            for k, ch in enumerate(letters):
+                # Along a column or a diagonal the k-th letter is k rows below the first one
+                masks = window[k - span - 1] if dy != 0 else window[-1]
+                found &= shift_columns(masks[ch], k * dx)
+            total += found.bit_count()
+    return total
+
+
+def count_crosses_ending(window: Deque[Masks]) -> int:
+    """Number of MAS crosses in the 3 rows of the window."""
+    if len(window) < 3:
+        return 0
+    top, middle, bottom = window[-3], window[-2], window[-1]
+    found = middle[A]
+    for left, right in ((top, bottom), (bottom, top)):
+        # The diagonal from the left cell of one row to the right cell of the other
+        first_m, first_s = shift_columns(left[M], -1), shift_columns(left[S], -1)
+        second_m, second_s = shift_columns(right[M], 1), shift_columns(right[S], 1)
+        found &= (first_m & second_s) | (first_s & second_m)
+    return found.bit_count()
+
+
+def count_word_array(numpy: Any, letters: Any, word: bytes) -> int:
+    """Occurrences of the word in the NumPy array of letters, in the 8 directions."""
+    height, width = letters.shape
+    span = len(word) - 1
+    masks = {ch: letters == ch for ch in set(word)}
+    total = 0
+    for dx, dy in DIRECTIONS:
+        # Starts of the word that keep it in the grid, as a rectangle
+        rows, cols = height - span * abs(dy), width - span * abs(dx)
+        if rows <= 0 or cols <= 0:
+            continue
+        y0, x0 = span * max(0, -dy), span * max(0, -dx)
+        views = [
+            masks[ch][y0 + k * dy : y0 + k * dy + rows, x0 + k * dx : x0 + k * dx + cols] for k, ch in enumerate(word)
+        ]
+        found = views[0] & views[1] if len(views) > 1 else views[0]
+        for view in views[2:]:
+            found &= view
+        total += int(numpy.count_nonzero(found))
+    return total
+
+
+def count_crosses_array(numpy: Any, letters: Any) -> int:
+    """Number of MAS crosses in the NumPy array of letters."""
+    if letters.shape[0] < 3 or letters.shape[1] < 3:
+        return 0
+    is_m, is_s = letters == M, letters == S
+    center = letters[1:-1, 1:-1] == A
+    # Corners around each center: both diagonals must hold an M and an S
+    top_left, top_right = (slice(None, -2), slice(None, -2)), (slice(None, -2), slice(2, None))
+    bottom_left, bottom_right = (slice(2, None), slice(None, -2)), (slice(2, None), slice(2, None))
+    for first, second in ((top_left, bottom_right), (top_right, bottom_left)):
+        center &= (is_m[first] & is_s[second]) | (is_s[first] & is_m[second])
+    return int(numpy.count_nonzero(center))
 
 
 class Solver:
 
     def __init__(self):
-        self.data = []
-        self.width = -1
-        self.height = -1
+        self.grid: Grid | None = None
+        self.crosses: List[Tuple[int, int, int, int]] = []
 
     def parse(self, path: str) -> None:
         with open(path) as hand:
-            for line in hand:
-                self.data.append(line.strip())
-        self.width = len(self.data[0])
-        self.height = len(self.data)
-
-    def _in_range(self, x: int, y: int) -> bool:
-        return 0 <= x < self.width and 0 <= y < self.height
-
-    def _find_xmas_at(self, x: int, y: int) -> int:
-        n_found = 0
-        for direction in DIRECTIONS:
-            dx, dy = direction
-            found = True
-            for pos, ch in enumerate("XMAS"):
-                cx, cy = x + pos * dx, y + pos * dy
-                if not self._in_range(cx, cy):
-                    found = False
-                    break
-                if self.data[cy][cx] != ch:
-                    found = False
-                    break
-            if found:
-                n_found += 1
-        return n_found
-
-    def _get_data_at(self, x: int, y: int) -> int | None:
-        if not self._in_range(x, y):
-            return None
-        return self.data[y][x]
-
-    def _has_xmas_at(self, x: int, y: int) -> bool:
-        if self.data[y][x] != "A":
-            return False
-        for diagonal in DIAGONALS:
-            m1x, m1y = diagonal
+            self.grid = Grid.from_lines(hand)
+        for m1x, m1y in DIAGONALS:
             m2x, m2y = m1y, -1 * m1x
-            s1x, s1y = -1 * m1x, -1 * m1y
-            s2x, s2y = -1 * m2x, -1 * m2y
-            m1x, m1y = vector_sum((x, y), (m1x, m1y))
-            m2x, m2y = vector_sum((x, y), (m2x, m2y))
-            s1x, s1y = vector_sum((x, y), (s1x, s1y))
-            s2x, s2y = vector_sum((x, y), (s2x, s2y))
-
-            if self._get_data_at(m1x, m1y) == "M" and self._get_data_at(m2x, m2y) == "M" and \
-               self._get_data_at(s1x, s1y) == "S" and self._get_data_at(s2x, s2y) == "S":
+            # Offsets of the two M and the two S around the A
+            self.crosses.append(
+                (
+                    self.grid.offset(m1x, m1y),
+                    self.grid.offset(m2x, m2y),
+                    self.grid.offset(-1 * m1x, -1 * m1y),
+                    self.grid.offset(-1 * m2x, -1 * m2y),
+                )
+            )
+
+    def _get_automaton(self, words: List[bytes]) -> aho_corasick.Automaton:
+        """Automaton of the words followed by the reversed words."""
+        return aho_corasick.Automaton(words + [word[::-1] for word in words])
+
+    def count_words(self, words: Iterable[bytes]) -> Dict[bytes, int]:
+        """Occurrences of each word in the 8 directions, in a single pass over the lines of the grid."""
+        words = list(dict.fromkeys(words))
+        automaton = self._get_automaton(words)
+        counts = [0] * len(automaton.words)
+        for dx, dy in LINES:
+            for _, line in self.grid.lines(dx, dy):
+                automaton.count(line, counts)
+        return {word: counts[index] + counts[index + len(words)] for index, word in enumerate(words)}
+
+    def find_words(self, words: Iterable[bytes]) -> Dict[bytes, List[Match]]:
+        """Every occurrence of each word in the 8 directions, in a single pass over the lines of the grid."""
+        words = list(dict.fromkeys(words))
+        automaton = self._get_automaton(words)
+        found: Dict[bytes, List[Match]] = {word: [] for word in words}
+        for dx, dy in LINES:
+            step = self.grid.offset(dx, dy)
+            for first, line in self.grid.lines(dx, dy):
+                for start, index in automaton.find(line):
+                    if index < len(words):
+                        word = words[index]
+                        x, y = self.grid.coords(first + start * step)
+                        found[word].append((x, y, dx, dy))
+                    else:
+                        # A reversed word read forwards is the word read backwards from its end
+                        word = words[index - len(words)]
+                        x, y = self.grid.coords(first + (start + len(word) - 1) * step)
+                        found[word].append((x, y, -dx, -dy))
+        return found
+
+    def _has_xmas_at(self, idx: int) -> bool:
+        data = self.grid.data
+        if data[idx] != A:
+            return False
+        for m1, m2, s1, s2 in self.crosses:
+            if data[idx + m1] == M and data[idx + m2] == M and data[idx + s1] == S and data[idx + s2] == S:
                 return True
         return False
 
+    def _stream_windows(self, path: str, letters: Iterable[int], depth: int) -> Generator[Deque[Masks], None, None]:
+        """The masks of the last `depth` rows read, after each row of the grid."""
+        tables = {ch: get_table(ch) for ch in set(letters)}
+        window = collections.deque(maxlen=depth)
+        with open(path, "rb") as hand:
+            for line in hand:
+                line = line.strip()
+                if line == b"":
+                    break
+                window.append({ch: int.from_bytes(line.translate(table), "little") for ch, table in tables.items()})
+                yield window
+
+    def stream_count_words(self, path: str, words: Iterable[bytes]) -> Dict[bytes, int]:
+        """Occurrences of each word in the 8 directions, keeping only as many rows as the longest word."""
+        counts = {word: 0 for word in words}
+        if len(counts) == 0:
+            return counts
+        letters = [ch for word in counts for ch in word]
+        depth = max(len(word) for word in counts)
+        for window in self._stream_windows(path, letters, depth):
+            for word in counts:
+                counts[word] += count_word_ending(window, word)
+        return counts
+
+    def _get_letters(self) -> Tuple[Any, Any] | None:
+        """NumPy and the letters of the grid as an array without its border, for large grids when NumPy is installed."""
+        numpy = reader.get_numpy(len(self.grid))
+        if numpy is None:
+            return None
+        padded = numpy.frombuffer(self.grid.data, dtype=numpy.uint8).reshape(self.grid.height + 2, self.grid.stride)
+        return numpy, padded[1:-1, 1:-1]
+
     def solve1(self) -> int:
+        arrays = self._get_letters()
+        if arrays is not None:
+            return count_word_array(*arrays, XMAS)
+        return self.count_words([XMAS])[XMAS]
+
+    def solve2(self) -> int:
+        arrays = self._get_letters()
+        if arrays is not None:
+            return count_crosses_array(*arrays)
         total = 0
-        for x in range(self.width):
-            for y in range(self.height):
-                total += self._find_xmas_at(x, y)
+        for idx in self.grid.indices():
+            if self._has_xmas_at(idx):
+                total += 1
         return total
 
-    def solve2(self) -> int:
+    def stream1(self, path: str) -> int:
+        return self.stream_count_words(path, [XMAS])[XMAS]
+
+    def stream2(self, path: str) -> int:
         total = 0
-        for x in range(self.width):
-            for y in range(self.height):
-                if self._has_xmas_at(x, y):
-                    total += 1
+        for window in self._stream_windows(path, [M, A, S], 3):
+            total += count_crosses_ending(window)
         return total
 
 
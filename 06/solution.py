@@ -1,126 +1,115 @@
 #!/usr/bin/env python
-from typing import Tuple, Set
+import os
+import sys
+from typing import Set
 
-GUARD = {"^": (-1, 0), ">": (0, 1), "V": (1, 0), "<": (0, -1)}
-DIRECTION_TO_GUARD = {value: key for key, value in GUARD.items()}
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aoc import counters
+from aoc.grid import Grid, BORDER
 
-Point = Tuple[int, int]
-Direction = Tuple[int, int]
+# Index of the direction in Grid.directions, clockwise from up
+GUARD = {"^": 0, ">": 1, "V": 2, "<": 3}
+DIRECTION_TO_GUARD = {value: key for key, value in GUARD.items()}
 
+OBSTACLE = ord("#")
+FLOOR = ord(".")
 
-def vector_sum(point: Point, direction: Direction) -> Point:
-    result = []
-    for p, d in zip(point, direction):
-        result.append(p + d)
-    return tuple(result)
+# A guard state is packed as position * 4 + direction
+State = int
 
 
-def turn_right(direction: Direction) -> Direction:
-    y, x = direction
-    return x, -y
+def turn_right(direction: int) -> int:
+    return (direction + 1) % 4
 
 
 class Solver:
 
     def __init__(self):
-        self.floor = None
+        self.floor: Grid | None = None
         self.start_position = None
         self.start_direction = None
-        self.height = -1
-        self.width = -1
 
     def parse(self, path: str) -> None:
-        self.floor = []
         with open(path) as hand:
-            for line in hand:
-                line = line.strip()
-                for x, ch in enumerate(line):
-                    if ch in GUARD:
-                        self.start_position = (len(self.floor), x)
-                        self.start_direction = GUARD[ch]
-                        line = line.replace(ch, ".")
-                        break
-                self.floor.append(line)
-        self.height = len(self.floor)
-        self.width = len(self.floor[0])
-
-    def _is_outside(self, point: Point) -> bool:
-        y, x = point
-        return x < 0 or x >= self.width or y < 0 or y >= self.height
-
-    def _is_obstacle(self, point: Point) -> bool:
-        y, x = point
-        ch = self.floor[y][x]
-        return ch == "#"
-
-    def _print(self, current: Point, direction: Direction) -> None:
-        status = []
-        for y, line in enumerate(self.floor):
-            status.append([ch for ch in line])
-        cy, cx = current
-        status[cy][cx] = DIRECTION_TO_GUARD[direction]
-        res = ["".join(line) for line in status]
-        print("\n".join(res))
-
-    def _move(
-        self, current: Point, direction: Direction, extra_obstacle: Point | None = None
-    ) -> Tuple[Point, Direction] | None:
-        next_step = vector_sum(current, direction)
-        if self._is_outside(next_step):
-            return None
-        elif self._is_obstacle(next_step) or next_step == extra_obstacle:
-            direction = turn_right(direction)
-            return current, direction
-        else:
-            # Move
-            return next_step, direction
-
-    def _get_visited(self) -> Set[Point]:
+            self.floor = Grid.from_lines(hand)
+        for ch, direction in GUARD.items():
+            position = self.floor.find(ord(ch))
+            if position != -1:
+                self.start_position = position
+                self.start_direction = direction
+                self.floor[position] = FLOOR
+                break
+
+    def _print(self, current: int, direction: int) -> None:
+        status = self.floor.copy()
+        status[current] = ord(DIRECTION_TO_GUARD[direction])
+        print(status)
+
+    def _get_visited(self) -> Set[int]:
+        data = self.floor.data
+        steps = self.floor.directions
         visited = set()
         point, direction = self.start_position, self.start_direction
         while True:
             visited.add(point)
-            next_position = self._move(point, direction)
-            if next_position is None:
+            next_step = point + steps[direction]
+            ch = data[next_step]
+            if ch == BORDER:
                 break
-            point, direction = next_position
+            elif ch == OBSTACLE:
+                direction = turn_right(direction)
+            else:
+                point = next_step
         return visited
 
     def solve1(self) -> int:
         visited = self._get_visited()
         return len(visited)
 
-    def _is_loop_with_obstacle(
-        self, point: Point, direction: Direction, obstacle: Point, visited: Set[Tuple[Point, Direction]]
-    ) -> bool:
-        is_loop = False
+    def _is_loop_with_obstacle(self, point: int, direction: int, obstacle: int, visited: Set[State]) -> bool:
+        data = self.floor.data
+        steps = self.floor.directions
         while True:
-            visited.add((point, direction))
-            next_position = self._move(point, direction, extra_obstacle=obstacle)
-            if next_position is None:
-                break
-            elif next_position in visited:
-                is_loop = True
-                break
-            point, direction = next_position
-        return is_loop
+            visited.add(point * 4 + direction)
+            next_step = point + steps[direction]
+            ch = data[next_step]
+            if ch == BORDER:
+                return False
+            elif ch == OBSTACLE or next_step == obstacle:
+                direction = turn_right(direction)
+            else:
+                point = next_step
+            if point * 4 + direction in visited:
+                return True
 
     def solve2(self) -> int:
-        visited: Set[Tuple[Point, Direction]] = set()
+        data = self.floor.data
+        steps = self.floor.directions
+        visited: Set[State] = set()
         point, direction = self.start_position, self.start_direction
-        checked: Set[Point] = set()
-        checked.add(self.start_position)
+        checked: Set[int] = {self.start_position}
         obstacles_that_cause_loop = 0
+        counting = counters.enabled
+        tried = 0
         while True:
-            visited.add((point, direction))
-            next_position = self._move(point, direction)
-            if next_position is None:
+            visited.add(point * 4 + direction)
+            next_step = point + steps[direction]
+            ch = data[next_step]
+            if ch == BORDER:
                 break
-            obstacle = next_position[0]
-            if obstacle not in checked and self._is_loop_with_obstacle(point, direction, obstacle, visited.copy()):
-                obstacles_that_cause_loop += 1
-            checked.add(obstacle)
-            point, direction = next_position
+            elif ch == OBSTACLE:
+                direction = turn_right(direction)
+                continue
+            if next_step not in checked:
+                if counting:
+                    tried += 1
+                if self._is_loop_with_obstacle(point, direction, next_step, visited.copy()):
+                    obstacles_that_cause_loop += 1
+            checked.add(next_step)
+            point = next_step
+        if counting:
+            counters.add("obstacles_tried", tried)
         return obstacles_that_cause_loop
 
 
@@ -1,7 +1,13 @@
 #!/usr/bin/env python
-from typing import List, Tuple
+import os
+import sys
+from typing import Generator, Iterable, List, Tuple
 
-Equation = Tuple[int, List[int]]
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aoc import memo, reader
+
+Equation = Tuple[int, Tuple[int, ...]]
 
 
 class Solver:
@@ -10,12 +16,10 @@ class Solver:
         self.equations: List[Equation] = []
 
     def parse(self, path: str) -> None:
-        with open(path) as hand:
-            for line in hand:
-                line = line.strip()
-                result, values = line.split(": ", maxsplit=1)
-                values_int = [int(value) for value in values.split(" ")]
-                self.equations.append((int(result), values_int))
+        results, values, offsets = reader.read_key_values(path)
+        values, offsets = list(values), list(offsets)
+        for result, start, end in zip(results, offsets, offsets[1:]):
+            self.equations.append((result, tuple(values[start:end])))
 
     def _is_valid(self, equation: Equation, additional_operator: bool = False) -> bool:
         expected, values = equation
@@ -36,20 +40,41 @@ class Solver:
             current_values = new_current_values
         return expected in current_values
 
-    def solve1(self) -> int:
+    def _check(self, equations: Iterable[Equation]) -> Generator[Tuple[Equation, bool], None, None]:
+        for equation in equations:
+            yield equation, self._is_valid(equation)
+
+    @memo.memoized
+    def _get_validity(self) -> List[bool]:
+        # Without concatenation, shared by both parts
+        return [self._is_valid(equation) for equation in self.equations]
+
+    def _calibrate(self, checked: Iterable[Tuple[Equation, bool]]) -> int:
         result = 0
-        for equation in self.equations:
-            if self._is_valid(equation):
+        for equation, valid in checked:
+            if valid:
                 result += equation[0]
         return result
 
-    def solve2(self) -> int:
+    def _calibrate_with_concatenation(self, checked: Iterable[Tuple[Equation, bool]]) -> int:
         result = 0
-        for equation in self.equations:
-            if self._is_valid(equation) or self._is_valid(equation, additional_operator=True):
+        for equation, valid in checked:
+            if valid or self._is_valid(equation, additional_operator=True):
                 result += equation[0]
         return result
 
+    def solve1(self) -> int:
+        return self._calibrate(zip(self.equations, self._get_validity()))
+
+    def solve2(self) -> int:
+        return self._calibrate_with_concatenation(zip(self.equations, self._get_validity()))
+
+    def stream1(self, path: str) -> int:
+        return self._calibrate(self._check(reader.iter_key_values(path)))
+
+    def stream2(self, path: str) -> int:
+        return self._calibrate_with_concatenation(self._check(reader.iter_key_values(path)))
+
 
 def main():
     solver = Solver()
@@ -1,10 +1,18 @@
 #!/usr/bin/env python
 import math
+import os
+import sys
 from typing import Tuple, Dict, Set, List
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aoc.grid import Grid
+
 Point = Tuple[int, int]
 Vector = Tuple[int, int]
 
+EMPTY = ord(".")
+
 
 def vector_diff(p1: Point, p2: Point) -> Vector:
     return p1[0] - p2[0], p1[1] - p2[1]
@@ -31,26 +39,23 @@ def reduce(v: Vector) -> Vector:
 class Solver:
 
     def __init__(self):
-        self.city = []
-        self.width = 0
-        self.height = 0
+        self.city: Grid | None = None
         self.antennas: Dict[str, List[Point]] = dict()
 
     def parse(self, path: str) -> None:
         with open(path) as hand:
-            for y, line in enumerate(hand):
-                line = line.strip()
-                self.city.append(line)
-                for x, ch in enumerate(line):
-                    if ch != ".":
-                        if ch not in self.antennas:
-                            self.antennas[ch] = list()
-                        self.antennas[ch].append((y, x))
-        self.height = len(self.city)
-        self.width = len(self.city[0])
+            self.city = Grid.from_lines(hand)
+        for idx in self.city.indices():
+            value = self.city[idx]
+            if value != EMPTY:
+                ch = chr(value)
+                if ch not in self.antennas:
+                    self.antennas[ch] = list()
+                x, y = self.city.coords(idx)
+                self.antennas[ch].append((y, x))
 
     def _is_inside_map(self, point: Point) -> bool:
-        return 0 <= point[0] < self.height and 0 <= point[1] < self.width
+        return self.city.contains(point[1], point[0])
 
     def solve1(self) -> int:
         antinodes = set()
@@ -77,14 +82,11 @@ class Solver:
         return nodes
 
     def __print_antinodes(self, nodes):
-        city_map = list()
-        for _ in range(self.height):
-            city_map.append(["."] * self.width)
+        city_map = Grid(self.city.width, self.city.height)
         for node in nodes:
             y, x = node
-            city_map[y][x] = "#"
-        printable = ["".join(line) for line in city_map]
-        print("\n".join(printable))
+            city_map[city_map.index(x, y)] = ord("#")
+        print(city_map)
 
     def solve2(self) -> int:
         antinodes: Set[Point] = set()
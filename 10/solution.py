@@ -1,71 +1,57 @@
 #!/usr/bin/env python
-from typing import Generator, Tuple
+import os
+import sys
+from typing import Dict, List, Set
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aoc import search
+from aoc.grid import Grid
+
+ZERO = ord("0")
+TOP = ord("9")
 
 
 class Solver:
 
     def __init__(self):
-        self.data = []
-        self.height = -1
-        self.width = -1
+        self.data: Grid | None = None
 
     def parse(self, path: str) -> None:
         with open(path) as hand:
-            for line in hand:
-                line = line.strip()
-                self.data.append([int(x) for x in line])
-        self.height = len(self.data)
-        self.width = len(self.data[0])
-
-    def _get_neighbours(self, y: int, x: int) -> Generator[Tuple[int, int], None, None]:
-        if y + 1 < self.height:
-            yield y + 1, x
-        if y > 0:
-            yield y - 1, x
-        if x + 1 < self.width:
-            yield y, x + 1
-        if x > 0:
-            yield y, x - 1
+            self.data = Grid.from_lines(hand)
 
     def solve1(self) -> int:
-        trail_heads = {}
-        for y, line in enumerate(self.data):
-            for x, char in enumerate(line):
-                if char == 9:
-                    trail_heads[(y, x)] = {(y, x)}
+        data = self.data.data
+        steps = self.data.directions
+        trail_heads: Dict[int, Set[int]] = {}
+        for point in self.data.find_all(TOP):
+            trail_heads[point] = {point}
         for el in range(8, -1, -1):
-            new_trail_heads = {}
+            height = ZERO + el
+            new_trail_heads: Dict[int, Set[int]] = {}
             for point, reachable in trail_heads.items():
-                y, x = point
-                for ny, nx in self._get_neighbours(y, x):
-                    if self.data[ny][nx] == el:
-                        candidate = (ny, nx)
+                for step in steps:
+                    candidate = point + step
+                    if data[candidate] == height:
                         if candidate not in new_trail_heads:
                             new_trail_heads[candidate] = set()
                         new_trail_heads[candidate].update(reachable)
-                trail_heads = new_trail_heads
+            trail_heads = new_trail_heads
 
         return sum([len(reachable) for reachable in trail_heads.values()])
 
     def solve2(self) -> int:
-        trail_heads = {}
-        for y, line in enumerate(self.data):
-            for x, char in enumerate(line):
-                if char == 9:
-                    trail_heads[(y, x)] = 1
-        for el in range(8, -1, -1):
-            new_trail_heads = {}
-            for point, reachable in trail_heads.items():
-                y, x = point
-                for ny, nx in self._get_neighbours(y, x):
-                    if self.data[ny][nx] == el:
-                        candidate = (ny, nx)
-                        if candidate not in new_trail_heads:
-                            new_trail_heads[candidate] = 0
-                        new_trail_heads[candidate] += reachable
-                trail_heads = new_trail_heads
+        data = self.data.data
+        steps = self.data.directions
+
+        def get_lower(point: int) -> List[int]:
+            height = data[point] - 1
+            return [point + step for step in steps if data[point + step] == height]
 
-        return sum(trail_heads.values())
+        # Every step goes down by one, so all the trails from a top to a trail head are shortest paths
+        field = search.bfs(len(self.data), self.data.find_all(TOP), get_lower, count_paths=True)
+        return sum(field.count_paths(point) for point in self.data.find_all(ZERO))
 
 
 def main():
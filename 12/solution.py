@@ -1,6 +1,13 @@
 #!/usr/bin/env python
+import os
+import sys
 from typing import Tuple, Generator, List, Set
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aoc import memo
+from aoc.grid import Grid, BORDER
+
 Point = Tuple[int, int]
 Direction = Tuple[int, int]
 RegionInfo = Tuple[int, int, int]
@@ -16,6 +23,8 @@ class Side:
     points.sort()
     self.points = tuple(points)"""
 
+    __slots__ = ("is_vertical", "height", "start", "direction")
+
     def __init__(self, is_vertical: bool, height: int, start: Point, direction: Direction) -> None:
         self.is_vertical = is_vertical
         self.height = height
@@ -66,31 +75,15 @@ class Side:
 class Solver:
 
     def __init__(self):
-        self.data = list()
-        self.width = 0
-        self.height = 0
+        self.data: Grid | None = None
 
     def parse(self, path: str) -> None:
         with open(path) as hand:
-            for line in hand:
-                line = line.strip()
-                self.data.append(line)
-        self.width = len(self.data[0])
-        self.height = len(self.data)
-
-    def _get_ch_at(self, point: Point) -> str | None:
-        y, x = point
-        if 0 <= y < self.height and 0 <= x < self.width:
-            return self.data[y][x]
-        else:
-            return None
+            self.data = Grid.from_lines(hand)
 
-    def _get_neighbours(self, point: Point) -> Generator[Point, None, None]:
-        y, x = point
-        yield y + 1, x
-        yield y - 1, x
-        yield y, x + 1
-        yield y, x - 1
+    def _get_point(self, idx: int) -> Point:
+        x, y = self.data.coords(idx)
+        return y, x
 
     def _count_sides(self, sides_set: Set[Side]) -> int:
         n_sides = 1
@@ -103,36 +96,43 @@ class Solver:
                 n_sides += 1
         return n_sides
 
-    def _explore(self) -> Generator[RegionInfo, None, None]:
-        boundary = {(0, 0)}
-        explored = set()
+    def _iter_regions(self) -> Generator[RegionInfo, None, None]:
+        data = self.data.data
+        steps = self.data.directions
+        boundary = {self.data.index(0, 0)}
+        explored = bytearray(len(data))
         while len(boundary) > 0:
             point = boundary.pop()
-            if point in explored:
+            if explored[point]:
                 continue
-            ch = self._get_ch_at(point)
+            ch = data[point]
             area_points = {point}
             region_area = 0
             region_perimeter = 0
             region_sides = set()
             while len(area_points) > 0:
                 new_point = area_points.pop()
-                if new_point in explored:
+                if explored[new_point]:
                     continue
-                for neighbour in self._get_neighbours(new_point):
-                    n_ch = self._get_ch_at(neighbour)
+                for step in steps:
+                    neighbour = new_point + step
+                    n_ch = data[neighbour]
                     if n_ch == ch:
                         area_points.add(neighbour)
                     else:
                         region_perimeter += 1
-                        region_sides.add(Side.new(new_point, neighbour))
-                        if n_ch is not None:
+                        region_sides.add(Side.new(self._get_point(new_point), self._get_point(neighbour)))
+                        if n_ch != BORDER:
                             boundary.add(neighbour)
                 region_area += 1
-                explored.add(new_point)
+                explored[new_point] = 1
             sides = self._count_sides(region_sides)
             yield region_area, region_perimeter, sides
 
+    @memo.memoized
+    def _explore(self) -> List[RegionInfo]:
+        return list(self._iter_regions())
+
     def solve1(self) -> int:
         total_price = 0
         for region_area, region_perimeter, _ in self._explore():
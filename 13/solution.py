@@ -1,12 +1,18 @@
 #!/usr/bin/env python
 import dataclasses
 import math
-from typing import Tuple, List, Generator, Set
+import os
+import sys
+from typing import Tuple, List, Generator, Set, Iterable
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aoc import reader
 
 Vector = Tuple[int, int]
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Machine:
     button_a: Tuple[int, int]
     button_b: Tuple[int, int]
@@ -72,9 +78,7 @@ class DiophantineSolver:
             ts = vector_sum(s, scalar_prod(-1, v))
 
             if min(ts) >= 0:
-                print(s, v, ts)
-                input()
-                raise Exception("*******")
+                raise Exception(f"{s} is not the smallest solution, {ts} is smaller")
 
         return s, v
 
@@ -141,24 +145,17 @@ class Solver:
         self.diophantine_solver = DiophantineSolver()
         self.solution_retriever = SolutionRetriever()
 
-    def _parse_value(self, line: str) -> Tuple[int, int]:
-        raw = line.split(": ", maxsplit=1)[1].split(", ")
-        return tuple(int(el[2:]) for el in raw)
+    def _iter_machines(self, path: str) -> Generator[Machine, None, None]:
+        # Button A: X+ax, Y+ay / Button B: X+bx, Y+by / Prize: X=px, Y=py
+        for ax, ay, bx, by, px, py in reader.iter_int_rows(path, 6):
+            yield Machine(button_a=(ax, ay), button_b=(bx, by), prize=(px, py))
 
     def parse(self, path: str) -> None:
-        with open(path) as hand:
-            lines = hand.readlines()
-            i = 0
-            while i < len(lines):
-                button_a = self._parse_value(lines[i])
-                button_b = self._parse_value(lines[i + 1])
-                prize = self._parse_value(lines[i + 2])
-                self.machines.append(Machine(button_a=button_a, button_b=button_b, prize=prize))
-                i += 4
-
-    def _solve(self, increase: int = 0) -> int:
+        self.machines = list(self._iter_machines(path))
+
+    def _solve(self, machines: Iterable[Machine], increase: int = 0) -> int:
         tokens = 0
-        for machine in self.machines:
+        for machine in machines:
             space_x = self.diophantine_solver.get_solution_space(
                 machine.button_a[0], machine.button_b[0], machine.prize[0] + increase
             )
@@ -175,9 +172,9 @@ class Solver:
             tokens += 3 * best_solution[0] + best_solution[1]
         return tokens
 
-    def solve1(self) -> int:
+    def _solve_small(self, machines: Iterable[Machine]) -> int:
         tokens = 0
-        for machine in self.machines:
+        for machine in machines:
             solve_x = self.diophantine_solver.solve(machine.button_a[0], machine.button_b[0], machine.prize[0])
             solve_y = self.diophantine_solver.solve(machine.button_a[1], machine.button_b[1], machine.prize[1])
             valid_solutions = solve_x & solve_y
@@ -192,25 +189,17 @@ class Solver:
                 tokens += best_cost
         return tokens
 
+    def solve1(self) -> int:
+        return self._solve_small(self.machines)
+
     def solve2(self) -> int:
-        increase = 10000000000000
-        tokens = 0
-        for machine in self.machines:
-            space_x = self.diophantine_solver.get_solution_space(
-                machine.button_a[0], machine.button_b[0], machine.prize[0] + increase
-            )
-            if space_x is None:
-                continue
-            space_y = self.diophantine_solver.get_solution_space(
-                machine.button_a[1], machine.button_b[1], machine.prize[1] + increase
-            )
-            if space_y is None:
-                continue
-            best_solution = self.solution_retriever.get_best_solution(space_x, space_y)
-            if best_solution is None:
-                continue
-            tokens += 3 * best_solution[0] + best_solution[1]
-        return tokens
+        return self._solve(self.machines, increase=10000000000000)
+
+    def stream1(self, path: str) -> int:
+        return self._solve_small(self._iter_machines(path))
+
+    def stream2(self, path: str) -> int:
+        return self._solve(self._iter_machines(path), increase=10000000000000)
 
 
 def main():
@@ -1,6 +1,12 @@
 #!/usr/bin/env python
 import collections
-from typing import Tuple, List, Dict, Set
+import os
+import sys
+from typing import Tuple, List, Dict, Set, Iterable
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aoc import reader
 
 Point = Tuple[int, int]
 Vector = Tuple[int, int]
@@ -60,17 +66,16 @@ class Solver:
         self.robot_positions: List[Tuple[Point, Vector]] = []
 
     def parse(self, path: str) -> None:
-        with open(path) as hand:
-            for el in hand:
-                p_raw, v_raw = el.split(" ")
-                pos = tuple(int(el) for el in p_raw[2:].split(","))
-                speed = tuple(int(el) for el in v_raw[2:].split(","))
-                self.robot_positions.append((pos, speed))
+        # p=x,y v=dx,dy
+        values = reader.read_int_rows(path, 4)
+        positions = zip(values[0::4], values[1::4])
+        speeds = zip(values[2::4], values[3::4])
+        self.robot_positions = list(zip(positions, speeds))
 
-    def solve1(self) -> int:
+    def _get_safety_factor(self, robot_positions: Iterable[Tuple[Point, Vector]]) -> int:
         map_space = MapSpace((101, 103))
         quadrants = collections.defaultdict(int)
-        for position in self.robot_positions:
+        for position in robot_positions:
             start, direction = position
             new_pos = map_space.vector_sum(start, map_space.scalar_prod(100, direction))
             quadrant = map_space.get_quadrant(new_pos)
@@ -82,6 +87,13 @@ class Solver:
             res *= el
         return res
 
+    def solve1(self) -> int:
+        return self._get_safety_factor(self.robot_positions)
+
+    def stream1(self, path: str) -> int:
+        robots = reader.iter_int_rows(path, 4)
+        return self._get_safety_factor(((x, y), (dx, dy)) for x, y, dx, dy in robots)
+
     def solve2(self) -> int:
         size = (101, 103)
         map_space = MapSpace(size)
@@ -1,77 +1,62 @@
 #!/usr/bin/env python
 import collections
+import os
+import sys
 from typing import Tuple, Dict, Iterable, List, Set, Deque
 
-CH_ROBOT = "@"
-CH_WALL = "#"
-CH_BOX = "O"
-CH_SPACE = "."
-CH_BOX_LEFT = "["
-CH_BOX_RIGHT = "]"
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 
-MOVEMENTS = {"^": (0, -1), "v": (0, 1), ">": (1, 0), "<": (-1, 0)}
+from aoc.grid import Grid, BORDER
 
-Point = Tuple[int, int]
-Box = Tuple[Point, Point]
+CH_ROBOT = ord("@")
+CH_WALL = ord("#")
+CH_BOX = ord("O")
+CH_SPACE = ord(".")
+CH_BOX_LEFT = ord("[")
+CH_BOX_RIGHT = ord("]")
 
+MOVEMENTS = {"^": (0, -1), "v": (0, 1), ">": (1, 0), "<": (-1, 0)}
 
-def vector_sum(point: Point, direction: Tuple[int, int]) -> Point:
-    return point[0] + direction[0], point[1] + direction[1]
+Point = int
+Box = Tuple[Point, Point]
 
 
 class Solver:
 
     def __init__(self):
-        self.warehouse = dict()
-        self.warehouse_width = 0
-        self.warehouse_height = 0
+        self.warehouse: Grid | None = None
         self.robot = None
         self.moves = list()
 
     def parse(self, path: str) -> None:
         with open(path) as hand:
-            for y, line in enumerate(hand):
-                line = line.strip()
-                if line.startswith("#"):
-                    self.warehouse_width = len(line)
-                    self.warehouse_height = y + 1
-                if line == "":
-                    break
-                for x, ch in enumerate(line):
-                    if ch == CH_ROBOT:
-                        self.robot = (x, y)
-                        self.warehouse[(x, y)] = CH_SPACE
-                    else:
-                        self.warehouse[(x, y)] = ch
+            self.warehouse = Grid.from_lines(hand)
             for line in hand:
                 line = line.strip()
                 for ch in line:
                     self.moves.append(ch)
+        self.robot = self.warehouse.find(CH_ROBOT)
+        self.warehouse[self.robot] = CH_SPACE
+
+    def _print_warehouse(self, positions: Grid, robot: Point) -> None:
+        status = positions.copy()
+        status[robot] = CH_ROBOT
+        print(status)
 
-    def _print_warehouse(self, positions: Dict[Point, str], robot: Point, expanded: bool = False) -> None:
-        width = self.warehouse_width
-        height = self.warehouse_height
-        if expanded:
-            width = width * 2
-        for y in range(height):
-            line = [positions[(x, y)] for x in range(width)]
-            if y == robot[1]:
-                line[robot[0]] = "@"
-            line = "".join(line)
-            print(line)
-
-    def _push(self, robot: Point, move: str, positions: Dict[Point, str]) -> Point:
-        direction = MOVEMENTS[move]
-        next_robot = vector_sum(robot, direction)
+    def _get_steps(self, positions: Grid) -> Dict[str, int]:
+        return {move: positions.offset(dx, dy) for move, (dx, dy) in MOVEMENTS.items()}
+
+    def _push(self, robot: Point, step: int, positions: Grid) -> Point:
+        next_robot = robot + step
         box_end = next_robot
         has_free = False
-        while 0 <= box_end[0] < self.warehouse_width and 0 <= box_end[1] < self.warehouse_height:
+        while positions[box_end] != BORDER:
             if positions[box_end] == CH_WALL:
                 break
             if positions[box_end] == CH_SPACE:
                 has_free = True
                 break
-            box_end = vector_sum(box_end, direction)
+            box_end += step
         if not has_free:
             return robot
         else:
@@ -80,43 +65,42 @@ class Solver:
             positions[next_robot] = CH_SPACE
             return next_robot
 
+    def _get_gps(self, positions: Grid, ch: int) -> int:
+        total_gps = 0
+        for pos in positions.find_all(ch):
+            x, y = positions.coords(pos)
+            total_gps += x + 100 * y
+        return total_gps
+
     def solve1(self) -> int:
         positions = self.warehouse.copy()
+        steps = self._get_steps(positions)
         robot = self.robot
         for move in self.moves:
-            robot = self._push(robot, move, positions)
-        total_gps = 0
-        for pos, ch in positions.items():
-            if ch == CH_BOX:
-                x, y = pos
-                total_gps += x + 100 * y
-        return total_gps
-
-    def _expanded_map(self) -> Dict[Point, str]:
-        expanded: Dict[Point, str] = dict()
-        for pos, ch in self.warehouse.items():
-            x, y = pos
-            if ch == CH_BOX:
-                expanded[(2 * x, y)] = CH_BOX_LEFT
-                expanded[(2 * x + 1, y)] = CH_BOX_RIGHT
-            else:
-                expanded[(2 * x, y)] = ch
-                expanded[(2 * x + 1, y)] = ch
-        return expanded
-
-    def _push_horizontal(self, robot: Point, direction: Tuple[int, int], positions: Dict[Point, str]) -> Point:
-        next_robot = vector_sum(robot, direction)
+            robot = self._push(robot, steps[move], positions)
+        return self._get_gps(positions, CH_BOX)
+
+    def _expanded_map(self) -> Grid:
+        rows = []
+        for y in range(self.warehouse.height):
+            row = self.warehouse.row(y).tobytes()
+            row = row.replace(b"#", b"##").replace(b".", b"..").replace(b"O", b"[]")
+            rows.append(row.decode())
+        return Grid.from_lines(rows)
+
+    def _push_horizontal(self, robot: Point, step: int, positions: Grid) -> Point:
+        next_robot = robot + step
         box_end = next_robot
         has_free = False
         boxes = collections.deque()
-        while 0 <= box_end[0] < 2 * self.warehouse_width:
+        while positions[box_end] != BORDER:
             if positions[box_end] == CH_WALL:
                 break
             if positions[box_end] == CH_SPACE:
                 has_free = True
                 break
             boxes.append(box_end)
-            box_end = vector_sum(box_end, direction)
+            box_end += step
         if not has_free:
             return robot
         else:
@@ -136,26 +120,24 @@ class Solver:
                     raise Exception("Unexpected")
             return next_robot
 
-    def _get_pushable_box(self, box: Box, direction: Tuple[int, int], positions: Dict[Point, str]) -> List[Box] | None:
+    def _get_pushable_box(self, box: Box, step: int, positions: Grid) -> List[Box] | None:
         can_be_pushed = True
         pushable_boxes: List[Box] = []
         for point in box:
-            next_point = vector_sum(point, direction)
+            next_point = point + step
             if positions[next_point] == CH_WALL:
                 can_be_pushed = False
                 break
             elif positions[next_point] == CH_BOX_LEFT:
-                pushable_boxes.append((next_point, vector_sum(next_point, (1, 0))))
+                pushable_boxes.append((next_point, next_point + 1))
             elif positions[next_point] == CH_BOX_RIGHT:
-                pushable_boxes.append((vector_sum(next_point, (-1, 0)), next_point))
+                pushable_boxes.append((next_point - 1, next_point))
         if can_be_pushed:
             return pushable_boxes
         else:
             return None
 
-    def _get_pushable(
-        self, box: Box, direction: Tuple[int, int], positions: Dict[Point, str]
-    ) -> Iterable[Set[Box]] | None:
+    def _get_pushable(self, box: Box, step: int, positions: Grid) -> Iterable[Set[Box]] | None:
         is_pushable = True
         border = {box}
         pushable_queue: Deque[Set[Box]] = collections.deque()
@@ -163,7 +145,7 @@ class Solver:
             pushable_queue.append(border)
             new_border = set()
             for box in border:
-                push_up = self._get_pushable_box(box, direction, positions)
+                push_up = self._get_pushable_box(box, step, positions)
                 if push_up is None:
                     is_pushable = False
                     break
@@ -176,53 +158,46 @@ class Solver:
         else:
             return None
 
-    def _push_boxes(
-        self, all_boxes: Iterable[Set[Box]], direction: Tuple[int, int], positions: Dict[Point, str]
-    ) -> None:
+    def _push_boxes(self, all_boxes: Iterable[Set[Box]], step: int, positions: Grid) -> None:
         for level in all_boxes:
             for box in level:
                 for point in box:
-                    if positions[vector_sum(point, direction)] != CH_SPACE:
+                    if positions[point + step] != CH_SPACE:
                         raise Exception("Unexpected non space")
-                    positions[vector_sum(point, direction)] = positions[point]
+                    positions[point + step] = positions[point]
                     positions[point] = CH_SPACE
 
-    def _push_vertical(self, robot: Point, direction: Tuple[int, int], positions: Dict[Point, str]) -> Point:
-        next_robot = vector_sum(robot, direction)
+    def _push_vertical(self, robot: Point, step: int, positions: Grid) -> Point:
+        next_robot = robot + step
         if positions[next_robot] == CH_SPACE:
             return next_robot
         elif positions[next_robot] == CH_WALL:
             return robot
         if positions[next_robot] == CH_BOX_RIGHT:
-            box = vector_sum(next_robot, (-1, 0)), next_robot
+            box = next_robot - 1, next_robot
         else:
-            box = next_robot, vector_sum(next_robot, (1, 0))
-        pushable = self._get_pushable(box, direction, positions)
+            box = next_robot, next_robot + 1
+        pushable = self._get_pushable(box, step, positions)
         if pushable is None:
             return robot
         else:
-            self._push_boxes(pushable, direction, positions)
+            self._push_boxes(pushable, step, positions)
             return next_robot
 
-    def _push_expanded(self, robot: Point, move: str, positions: Dict[Point, str]) -> Point:
-        direction = MOVEMENTS[move]
-        if direction[1] == 0:
-            return self._push_horizontal(robot, direction, positions)
+    def _push_expanded(self, robot: Point, move: str, steps: Dict[str, int], positions: Grid) -> Point:
+        if MOVEMENTS[move][1] == 0:
+            return self._push_horizontal(robot, steps[move], positions)
         else:
-            return self._push_vertical(robot, direction, positions)
+            return self._push_vertical(robot, steps[move], positions)
 
     def solve2(self) -> int:
         positions = self._expanded_map()
-        robot = self.robot[0] * 2, self.robot[1]
+        steps = self._get_steps(positions)
+        x, y = self.warehouse.coords(self.robot)
+        robot = positions.index(2 * x, y)
         for move in self.moves:
-            robot = self._push_expanded(robot, move, positions)
-
-        total_gps = 0
-        for pos, ch in positions.items():
-            if ch == CH_BOX_LEFT:
-                x, y = pos
-                total_gps += x + 100 * y
-        return total_gps
+            robot = self._push_expanded(robot, move, steps, positions)
+        return self._get_gps(positions, CH_BOX_LEFT)
 
 
 def main():
@@ -1,9 +1,16 @@
 #!/usr/bin/env python
 import collections
+import os
+import sys
 from typing import List, Deque
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aoc import counters
+
 
 class Memory:
+    __slots__ = ("a", "b", "c", "instructions")
 
     def __init__(self, a: int, b: int, c: int, instructions: List[int]) -> None:
         self.a = a
@@ -189,10 +196,16 @@ class Interpreter:
         ]
 
     def run(self) -> None:
+        counting = counters.enabled
+        executed = 0
         while self.pointer < len(self.memory.instructions):
             iid = self.memory.instructions[self.pointer]
             instruction = self.instructions[iid]
             self.pointer = instruction.execute(self.pointer)
+            if counting:
+                executed += 1
+        if counting:
+            counters.add("instructions", executed)
 
     def print(self) -> None:
         while self.pointer < len(self.memory.instructions):
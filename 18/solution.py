@@ -1,49 +1,31 @@
 #!/usr/bin/env python
-from typing import Tuple, List, Set, Generator
+import os
+import sys
+from typing import Tuple, List, Iterable
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aoc import reader, search
+from aoc.grid import Grid
 
 Point = Tuple[int, int]
 
+SAFE = ord(".")
+CORRUPTED = ord("#")
+
 
 class Maze:
 
-    def __init__(self, width: int, height: int, occupied: Set[Point]) -> None:
-        self.width = width
-        self.height = height
-        self.occupied = occupied
-
-    def _get_neighbours(self, point: Point) -> Generator[Point, None, None]:
-        x, y = point
-        if x > 0:
-            yield x - 1, y
-        if x < self.width - 1:
-            yield x + 1, y
-        if y > 0:
-            yield x, y - 1
-        if y < self.height - 1:
-            yield x, y + 1
-
-    def explore(self) -> int:
-        maze: List[List[int | None]] = []
-        for _ in range(self.height):
-            maze.append([None] * self.width)
-
-        border: Set[Point] = {(0, 0)}
-        maze[0][0] = 0
-        explored: Set[Point] = self.occupied.copy()
-        distance = 1
-        while len(border) > 0:
-            new_border: Set[Point] = set()
-            for el in border:
-                for point in self._get_neighbours(el):
-                    if point in explored:
-                        continue
-                    x, y = point
-                    maze[y][x] = distance
-                    new_border.add(point)
-                explored.add(el)
-            border = new_border
-            distance += 1
-        return maze[self.height - 1][self.width - 1]
+    def __init__(self, width: int, height: int, occupied: Iterable[Point]) -> None:
+        self.grid = Grid(width, height, fill=SAFE)
+        for x, y in occupied:
+            self.grid[self.grid.index(x, y)] = CORRUPTED
+
+    def explore(self) -> int | None:
+        start = self.grid.index(0, 0)
+        end = self.grid.index(self.grid.width - 1, self.grid.height - 1)
+        field = search.grid_bfs(self.grid, [start], [SAFE], target=end)
+        return field[end] if field.reached(end) else None
 
 
 class Solver:
@@ -52,14 +34,11 @@ class Solver:
         self.positions: List[Point] = []
 
     def parse(self, path: str) -> None:
-        with open(path) as hand:
-            for line in hand:
-                line = line.strip()
-                self.positions.append(tuple(int(x) for x in line.split(",")))
+        values = reader.read_int_rows(path, 2)
+        self.positions = list(zip(values[0::2], values[1::2]))
 
     def solve(self, num_pixels: int) -> int | None:
-        occupied = set(self.positions[:num_pixels])
-        maze = Maze(71, 71, occupied)
+        maze = Maze(71, 71, self.positions[:num_pixels])
         return maze.explore()
 
     def solve1(self) -> int:
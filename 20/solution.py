@@ -1,57 +1,37 @@
 #!/usr/bin/env python
-from typing import Tuple, Dict, Set, Generator, List
+import os
+import sys
+from typing import Tuple, Generator, List
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aoc import memo, search
+from aoc.grid import Grid
 
 Point = Tuple[int, int]
 
+TRACK = ord(".")
+
 
 class Solver:
 
     def __init__(self):
-        self.maze = list()
-        self.start: Point | None = None
-        self.end: Point | None = None
-        self.width = 0
-        self.height = 0
+        self.maze: Grid | None = None
+        self.start: int | None = None
+        self.end: int | None = None
 
     def parse(self, path: str) -> None:
         with open(path) as hand:
-            for y, line in enumerate(hand):
-                line = line.strip()
-                self.maze.append(line)
-                for x, ch in enumerate(line):
-                    if ch == "S":
-                        self.start = (x, y)
-                    elif ch == "E":
-                        self.end = (x, y)
-        self.height = len(self.maze)
-        self.width = len(self.maze[0])
-
-    def _get_neighbours(self, point: Point) -> Generator[Point, None, None]:
-        x, y = point
-        if x > 0:
-            yield x - 1, y
-        if x < self.width - 1:
-            yield x + 1, y
-        if y > 0:
-            yield x, y - 1
-        if y < self.height - 1:
-            yield x, y + 1
-
-    def explore(self) -> Tuple[List[Point], Dict[Point, int]]:
-        path: List[Point] = []
-        distance: Dict[Point, int] = {}
-        path.append(self.start)
-        distance[self.start] = 0
-        while path[-1] != self.end:
-            for el in self._get_neighbours(path[-1]):
-                if el in distance:
-                    continue
-                x, y = el
-                if self.maze[y][x] != "#":
-                    distance[el] = len(path)
-                    path.append(el)
-                    break
-        return path, distance
+            self.maze = Grid.from_lines(hand)
+        self.start = self.maze.find(ord("S"))
+        self.end = self.maze.find(ord("E"))
+        self.maze[self.start] = TRACK
+        self.maze[self.end] = TRACK
+
+    @memo.memoized
+    def explore(self) -> Tuple[List[int], search.DistanceField]:
+        distance = search.grid_bfs(self.maze, [self.start], [TRACK], target=self.end, predecessors=True)
+        return distance.path_to(self.end), distance
 
     def _get_at_distance(self, point: Point, distance: int) -> Generator[Point, None, None]:
         x, y = point
@@ -63,24 +43,33 @@ class Solver:
                 for delta_y in y_range:
                     yield x + delta_x, y + delta_y
 
-    def _get_cheats_from(self, point: Point, new_rules: bool = False) -> Generator[Tuple[int, Point], None, None]:
-        if new_rules:
-            for target in range(2, 21):
-                for x, y in self._get_at_distance(point, distance=target):
-                    if 0 <= x < self.width and 0 <= y < self.height and self.maze[y][x] != "#":
-                        yield target, (x, y)
-        else:
-            for x, y in self._get_at_distance(point, distance=2):
-                if 0 <= x < self.width and 0 <= y < self.height and self.maze[y][x] != "#":
-                    yield 2, (x, y)
+    def _get_cheat_moves(self, new_rules: bool = False) -> List[Tuple[int, int, int, int]]:
+        """Length, shift along x and y, and flat offset of every allowed cheat."""
+        targets = range(2, 21) if new_rules else [2]
+        moves = []
+        for target in targets:
+            for dx, dy in self._get_at_distance((0, 0), distance=target):
+                moves.append((target, dx, dy, self.maze.offset(dx, dy)))
+        return moves
+
+    def _get_cheats_from(
+        self, point: int, moves: List[Tuple[int, int, int, int]]
+    ) -> Generator[Tuple[int, int], None, None]:
+        data = self.maze.data
+        width, height = self.maze.width, self.maze.height
+        x, y = self.maze.coords(point)
+        for target, dx, dy, offset in moves:
+            if 0 <= x + dx < width and 0 <= y + dy < height and data[point + offset] == TRACK:
+                yield target, point + offset
 
     def solve(self, new_rules: bool = False):
         path, distance = self.explore()
+        moves = self._get_cheat_moves(new_rules=new_rules)
         total_cost = distance[self.end]
         result = 0
         for el in path:
             current = distance[el]
-            for cheat_distance, cheat in self._get_cheats_from(el, new_rules=new_rules):
+            for cheat_distance, cheat in self._get_cheats_from(el, moves):
                 new_distance = current + cheat_distance - 1 + (len(path) - distance[cheat])
                 saving = total_cost - new_distance
                 if saving >= 100:
@@ -1,7 +1,13 @@
 #!/usr/bin/env python
 import collections
 import functools
-from typing import List, Tuple, Dict, Set
+import os
+import sys
+from typing import List, Tuple, Dict, Set, Iterable
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aoc import reader
 
 ChangeSequence = Tuple[int, int, int, int]
 
@@ -20,19 +26,16 @@ class Solver:
         self.secrets: List[int] = list()
 
     def parse(self, path: str) -> None:
-        with open(path) as hand:
-            for line in hand:
-                line = line.strip()
-                self.secrets.append(int(line))
+        self.secrets = list(reader.read_ints(path))
 
     def _get_next_secret_number(self, secret: int) -> int:
         secret = prune(mix(secret * 64, secret))
         secret = prune(mix(secret // 32, secret))
         return prune(mix(secret * 2048, secret))
 
-    def solve1(self) -> int:
+    def _sum_secrets(self, secrets: Iterable[int]) -> int:
         total = 0
-        for secret in self.secrets:
+        for secret in secrets:
             for _ in range(2000):
                 secret = self._get_next_secret_number(secret)
             total += secret
@@ -60,10 +63,10 @@ class Solver:
                     sequence_to_price[change_seq] = prices[i]
         return sequence_to_price
 
-    def solve2(self) -> int:
+    def _get_max_sell(self, secrets: Iterable[int]) -> int:
         sequence_to_value: Dict[ChangeSequence, int] = collections.defaultdict(int)
         max_sell = 0
-        for secret in self.secrets:
+        for secret in secrets:
             sequence_to_sell = self._get_sequence_to_price(secret)
             for sequence, price in sequence_to_sell.items():
                 sequence_to_value[sequence] += price
@@ -71,6 +74,18 @@ class Solver:
                     max_sell = sequence_to_value[sequence]
         return max_sell
 
+    def solve1(self) -> int:
+        return self._sum_secrets(self.secrets)
+
+    def solve2(self) -> int:
+        return self._get_max_sell(self.secrets)
+
+    def stream1(self, path: str) -> int:
+        return self._sum_secrets(secret for (secret,) in reader.iter_int_rows(path, 1))
+
+    def stream2(self, path: str) -> int:
+        return self._get_max_sell(secret for (secret,) in reader.iter_int_rows(path, 1))
+
 
 def main():
     solver = Solver()
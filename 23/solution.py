@@ -1,12 +1,21 @@
 #!/usr/bin/env python
+import os
+import sys
 from typing import Tuple, List, Dict, Set
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aoc import counters
+
 
 class Solver:
 
     def __init__(self):
         self._graph: List[Tuple[str, str]] = []
         self._connections: Dict[str, Set[str]] = {}
+        # Calls of _expand_cluster during solve2, only counted when the counters are enabled
+        self._counting = False
+        self._expand_calls = 0
 
     def parse(self, path: str) -> None:
         with open(path) as hand:
@@ -41,6 +50,8 @@ class Solver:
         return len(valid_pairs)
 
     def _expand_cluster(self, points: List[str], current_cluster: Set[str]) -> Set[str]:
+        if self._counting:
+            self._expand_calls += 1
         if len(points) == 0:
             return current_cluster
         if len(current_cluster) == 0:
@@ -60,12 +71,16 @@ class Solver:
 
     def solve2(self) -> str:
         max_cluster: Set[str] = set()
+        self._counting = counters.enabled
+        self._expand_calls = 0
         for key, connections in self._connections.items():
             base_cluster = connections.copy()
             base_cluster.add(key)
             candidate: Set[str] = self._expand_cluster(list(connections), base_cluster)
             if len(candidate) > len(max_cluster):
                 max_cluster = candidate
+        if self._counting:
+            counters.add("expand_cluster_calls", self._expand_calls)
         candidate_sorted = list(max_cluster)
         candidate_sorted.sort()
         return ",".join(candidate_sorted)
@@ -1,12 +1,20 @@
 #!/usr/bin/env python
+import os
+import sys
 from typing import Dict, Tuple, Set, List
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aoc import counters
+
 
 class LoopException(Exception):
     pass
 
 
 class Gate:
+    __slots__ = ("inputs", "operation")
+
     def __init__(self, inputs: Tuple[str, str], operation: str) -> None:
         self.inputs = inputs
         self.operation = operation
@@ -47,16 +55,22 @@ class Evaluator:
             for child in self.parent_to_children[key]:
                 to_evaluate.add(child)
 
+        counting = counters.enabled
+        evaluated = 0
         while len(to_evaluate) > 0:
             current = to_evaluate.pop()
             gate = self.gates[current]
             res = gate(values)
+            if counting:
+                evaluated += 1
             if res is not None:
                 if current in values:
                     raise LoopException()
                 values[current] = res
                 for child in self.parent_to_children.get(current, []):
                     to_evaluate.add(child)
+        if counting:
+            counters.add("gate_evaluations", evaluated)
         return values
 
 
@@ -232,7 +246,8 @@ class Solver:
                 gates_to_swap.remove(gid)
             prev_rem = tester.evaluate_remainder(input_x, input_y, prev_rem=prev_rem)
 
-            if i == 43:
+            # The carry out of the second to last bit is checked by the output of the last one
+            if i == len(self.out_gates) - 3:
                 break
 
         fixes.sort()
@@ -0,0 +1,19 @@
+import argparse
+
+from aoc import batch, bench, generators, runner, server
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python3 -m aoc", description="Advent of Code 2024 tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    runner.add_parser(subparsers)
+    bench.add_parser(subparsers)
+    batch.add_parser(subparsers)
+    server.add_parser(subparsers)
+    generators.add_parser(subparsers)
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Search of many words at once in byte strings, with an Aho-Corasick automaton.
+
+The automaton reads each byte of the text once, whatever the number of words: its states are the
+prefixes of the words, and the transitions of each state are completed through the failure links
+so that reading a byte is a single lookup. Every state knows the words ending on it, including the
+words that are suffixes of longer ones.
+
+    automaton = aho_corasick.Automaton([b"XMAS", b"SAMX"])
+    for start, word in automaton.find(text):
+        ...
+    counts = automaton.count(text)
+
+Words may overlap and may be repeated, every occurrence of every word is reported.
+"""
+import collections
+from typing import Dict, Generator, Iterable, List, Tuple
+
+ROOT = 0
+
+
+class Automaton:
+
+    __slots__ = ("words", "transitions", "outputs")
+
+    def __init__(self, words: Iterable[bytes]) -> None:
+        self.words = list(words)
+        # The bytes that no word contains go back to the root, the others have a transition
+        self.transitions: List[Dict[int, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for index, word in enumerate(self.words):
+            if len(word) == 0:
+                raise ValueError("Cannot search an empty word")
+            state = ROOT
+            for ch in word:
+                following = self.transitions[state].get(ch)
+                if following is None:
+                    following = len(self.transitions)
+                    self.transitions[state][ch] = following
+                    self.transitions.append({})
+                    outputs.append([])
+                state = following
+            outputs[state].append(index)
+        alphabet = {ch for word in self.words for ch in word}
+        # Breadth first, so the failure link of a state is complete before the state itself
+        queue = collections.deque(self.transitions[ROOT].values())
+        failures = [ROOT] * len(self.transitions)
+        for ch in alphabet:
+            self.transitions[ROOT].setdefault(ch, ROOT)
+        while queue:
+            state = queue.popleft()
+            failure = failures[state]
+            outputs[state].extend(outputs[failure])
+            for ch in alphabet:
+                following = self.transitions[state].get(ch)
+                if following is None:
+                    self.transitions[state][ch] = self.transitions[failure][ch]
+                else:
+                    failures[following] = self.transitions[failure][ch]
+                    queue.append(following)
+        self.outputs: List[Tuple[int, ...]] = [tuple(output) for output in outputs]
+
+    def find(self, text: bytes) -> Generator[Tuple[int, int], None, None]:
+        """Start position and index of the word of every occurrence, by increasing end position."""
+        transitions, outputs, words = self.transitions, self.outputs, self.words
+        state = ROOT
+        for position, ch in enumerate(text):
+            state = transitions[state].get(ch, ROOT)
+            if outputs[state]:
+                for index in outputs[state]:
+                    yield position + 1 - len(words[index]), index
+
+    def count(self, text: bytes, counts: List[int] | None = None) -> List[int]:
+        """Number of occurrences of each word, added to the counts when given."""
+        if counts is None:
+            counts = [0] * len(self.words)
+        transitions, outputs = self.transitions, self.outputs
+        state = ROOT
+        for ch in text:
+            state = transitions[state].get(ch, ROOT)
+            if outputs[state]:
+                for index in outputs[state]:
+                    counts[index] += 1
+        return counts
@@ -0,0 +1,106 @@
+import argparse
+import concurrent.futures
+import glob
+import itertools
+import json
+import os
+import sys
+import time
+from typing import Dict, Any, Generator, Iterable, List, TextIO
+
+from aoc import days, parse_cache
+
+Result = Dict[str, Any]
+
+
+def expand_inputs(patterns: Iterable[str]) -> Generator[str, None, None]:
+    """Files matched by each pattern, a directory standing for all the files in it."""
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+        else:
+            paths = glob.glob(pattern)
+        for path in sorted(paths):
+            if os.path.isfile(path) and not path.endswith(parse_cache.CACHE_SUFFIX):
+                yield path
+
+
+def _init_worker(day: int) -> None:
+    # Some solvers print debug output, it would end up in the middle of the results
+    with open(os.devnull, "w") as devnull:
+        os.dup2(devnull.fileno(), 1)
+    days.load_module(day)
+
+
+def solve_file(day: int, path: str, parts: List[int]) -> Result:
+    result: Result = {"file": path}
+    try:
+        solver = days.load_module(day).Solver()
+        wall = time.perf_counter()
+        solver.parse(path)
+        result["parse_wall"] = time.perf_counter() - wall
+        for part in parts:
+            wall = time.perf_counter()
+            answer = getattr(solver, days.PARTS[part])()
+            result[f"part{part}"] = str(answer)
+            result[f"part{part}_wall"] = time.perf_counter() - wall
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def solve_files(day: int, paths: List[str], parts: List[int]) -> List[Result]:
+    return [solve_file(day, path, parts) for path in paths]
+
+
+def run_batch(day: int, paths: Iterable[str], parts: List[int], jobs: int, chunk: int, out: TextIO) -> int:
+    """Solve every input, writing one JSON line per input in order of completion.
+
+    The inputs are sent to the workers `chunk` at a time, to amortize the cost of the round trip on
+    small inputs, and at most `2 * jobs` chunks are queued at once, so the paths can come from a
+    lazy iterator. Returns the number of inputs that failed.
+    """
+    failed = 0
+    pending = set()
+    paths = iter(paths)
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(day,))
+    with executor:
+        while True:
+            while len(pending) < 2 * jobs:
+                chunk_paths = list(itertools.islice(paths, chunk))
+                if len(chunk_paths) == 0:
+                    break
+                pending.add(executor.submit(solve_files, day, chunk_paths, parts))
+            if len(pending) == 0:
+                break
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                for result in future.result():
+                    if "error" in result:
+                        failed += 1
+                    out.write(json.dumps(result) + "\n")
+            out.flush()
+    return failed
+
+
+def main(args: argparse.Namespace) -> None:
+    parts = [args.part] if args.part is not None else days.get_parts(args.day)
+    paths = expand_inputs(args.inputs)
+    if args.output is None:
+        failed = run_batch(args.day, paths, parts, args.jobs, args.chunk, sys.stdout)
+    else:
+        with open(args.output, "w") as hand:
+            failed = run_batch(args.day, paths, parts, args.jobs, args.chunk, hand)
+    if failed > 0:
+        sys.exit(f"{failed} inputs failed")
+
+
+def add_parser(subparsers: argparse._SubParsersAction) -> None:
+    parser = subparsers.add_parser("batch", help="solve one day for many inputs, one JSON line per input")
+    parser.add_argument("day", type=int)
+    parser.add_argument("inputs", nargs="+", help="input files, directories or glob patterns")
+    parser.add_argument("--part", type=int, choices=sorted(days.PARTS), help="only solve this part")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("--chunk", type=int, default=16, help="number of inputs sent to a worker at once")
+    parser.add_argument("--output", help="write the JSON lines to this file instead of the standard output")
+    parser.set_defaults(func=main)
@@ -0,0 +1,341 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import queue
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, Any, List, Callable, Tuple
+
+from aoc import days, generators
+
+DEFAULT_SIZES = [100, 1000, 10000]
+DEFAULT_SCALES = [10, 100]
+PHASES = ["parse"] + [days.PARTS[part] for part in sorted(days.PARTS)]
+
+Measurement = Dict[str, Any]
+# Number of records, None for the input as is, and the shape of the records: generator parameters
+# or the scale of the length of each record
+Case = Tuple[int | None, Dict[str, int]]
+
+
+def _split_header(lines: List[str]) -> Tuple[List[str], List[str]]:
+    idx = lines.index("")
+    return lines[: idx + 1], lines[idx + 1 :]
+
+
+def resample_records(text: str, size: int, header: bool = False, block: int = 1) -> str:
+    """Cycle through the records of an input until there are `size` of them.
+
+    A record is `block` consecutive non empty lines, records made of more than one line are
+    separated by an empty line. When `header` is set everything up to the first empty line is kept.
+    """
+    lines = text.splitlines()
+    head: List[str] = []
+    if header:
+        head, lines = _split_header(lines)
+    lines = [line for line in lines if line != ""]
+    records = ["\n".join(lines[i : i + block]) for i in range(0, len(lines), block)]
+    separator = "\n\n" if block > 1 else "\n"
+    body = separator.join(records[i % len(records)] for i in range(size))
+    return "\n".join(head + [body]) + "\n"
+
+
+def resample_text(text: str, size: int, even: bool = False) -> str:
+    """Repeat a single line input up to `size` characters."""
+    text = text.strip()
+    if even and len(text) % 2 == 1:
+        # Keep the file/free space alternation of the disk map when wrapping around
+        text = text[:-1]
+    repeat = size // len(text) + 1
+    return (text * repeat)[:size] + "\n"
+
+
+def resample_words(text: str, size: int) -> str:
+    words = text.split()
+    return " ".join(words[i % len(words)] for i in range(size)) + "\n"
+
+
+def stretch_reports(text: str, scale: int) -> str:
+    """Make every report `scale` times longer, repeating the steps between its levels."""
+    reports = []
+    for line in text.splitlines():
+        levels = [int(el) for el in line.split()]
+        if len(levels) == 0:
+            continue
+        steps = [after - before for before, after in zip(levels, levels[1:])] or [1]
+        for i in range(len(levels) * (scale - 1)):
+            levels.append(levels[-1] + steps[i % len(steps)])
+        reports.append(" ".join(str(el) for el in levels))
+    return "\n".join(reports) + "\n"
+
+
+# How the input of each day can be scaled to a given number of records,
+# days not listed are only benchmarked on the input as is
+RESAMPLERS: Dict[int, Callable[[str, int], str]] = {
+    1: resample_records,
+    2: resample_records,
+    3: resample_text,
+    5: lambda text, size: resample_records(text, size, header=True),
+    7: resample_records,
+    9: lambda text, size: resample_text(text, size, even=True),
+    11: resample_words,
+    13: lambda text, size: resample_records(text, size, block=3),
+    14: resample_records,
+    18: resample_records,
+    19: lambda text, size: resample_records(text, size, header=True),
+    22: resample_records,
+    23: resample_records,
+    25: lambda text, size: resample_records(text, size, block=7),
+}
+
+# How the records of the input of each day can be made longer, for the days whose cost grows with
+# the length of a record. The rules of day 05 only order the pages of the real updates, so its
+# longer updates are only generated.
+STRETCHERS: Dict[int, Callable[[str, int], str]] = {
+    2: stretch_reports,
+}
+
+
+def get_input_text(
+    day: int, case: Case, source: str, input_name: str, seed: int, params: Dict[str, int]
+) -> str:
+    size, shape = case
+    if source == "generate":
+        return generators.generate_text(day, size, seed=seed, **{**params, **shape})
+    with open(os.path.join(days.get_day_dir(day), input_name)) as hand:
+        text = hand.read()
+    if size is not None:
+        text = RESAMPLERS[day](text, size)
+    if "scale" in shape:
+        text = STRETCHERS[day](text, shape["scale"])
+    return text
+
+
+def _measure(day: int, path: str, phase: str, track_memory: bool) -> Tuple[float, int | None]:
+    solver = days.load_module(day).Solver()
+    if phase != "parse":
+        solver.parse(path)
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    if phase == "parse":
+        solver.parse(path)
+    else:
+        getattr(solver, phase)()
+    elapsed = time.perf_counter() - start
+    peak = None
+    if track_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def _bench_worker(day: int, path: str, phases: List[str], repeat: int, out: multiprocessing.Queue) -> None:
+    with open(os.devnull, "w") as devnull:
+        os.dup2(devnull.fileno(), 1)
+    for phase in phases:
+        try:
+            times = [_measure(day, path, phase, track_memory=False)[0] for _ in range(repeat)]
+            # Tracing allocations slows things down, so the peak is taken on a separate run
+            _, peak = _measure(day, path, phase, track_memory=True)
+            out.put({"phase": phase, "times": times, "peak_bytes": peak})
+        except Exception as e:
+            out.put({"phase": phase, "error": f"{type(e).__name__}: {e}"})
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def bench_day(day: int, case: Case, text: str, phases: List[str], repeat: int, timeout: float) -> List[Measurement]:
+    """Benchmark one input in a separate process, so that a runaway solver can be stopped."""
+    measurements: List[Measurement] = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "input")
+        with open(path, "w") as hand:
+            hand.write(text)
+        out = multiprocessing.Queue()
+        worker = multiprocessing.Process(target=_bench_worker, args=(day, path, phases, repeat, out))
+        worker.start()
+        deadline = time.monotonic() + timeout
+        done = set()
+        while len(done) < len(phases):
+            try:
+                result = out.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            done.add(result["phase"])
+            measurements.append(result)
+        if worker.is_alive():
+            worker.terminate()
+        worker.join()
+        for phase in phases:
+            if phase not in done:
+                measurements.append({"phase": phase, "error": "timeout"})
+    for measurement in measurements:
+        measurement["day"] = day
+        measurement["size"], measurement["shape"] = case
+        if "times" in measurement:
+            measurement["median"] = statistics.median(measurement["times"])
+            measurement["p95"] = percentile(measurement["times"], 95)
+    return measurements
+
+
+def get_cases(day: int, sizes: List[int] | None, source: str) -> List[Case]:
+    """The ladder of sizes, then when no sizes are given the ladder of record lengths."""
+    if source == "generate":
+        cases: List[Case] = [(size, {}) for size in sizes or generators.LADDERS[day]]
+        if sizes is None and day in generators.SHAPE_LADDERS:
+            size, shapes = generators.SHAPE_LADDERS[day]
+            cases.extend((size, shape) for shape in shapes)
+        return cases
+    if day not in RESAMPLERS:
+        return [(None, {})]
+    cases = [(size, {}) for size in sizes or DEFAULT_SIZES]
+    if sizes is None and day in STRETCHERS:
+        cases.extend((None, {"scale": scale}) for scale in DEFAULT_SCALES)
+    return cases
+
+
+def run_bench(
+    selected_days: List[int],
+    sizes: List[int] | None,
+    repeat: int,
+    timeout: float,
+    source: str = "generate",
+    input_name: str = "input",
+    seed: int = 0,
+    params: Dict[str, int] | None = None,
+) -> List[Measurement]:
+    measurements: List[Measurement] = []
+    for day in selected_days:
+        phases = ["parse"] + [days.PARTS[part] for part in days.get_parts(day)]
+        for case in get_cases(day, sizes, source):
+            try:
+                text = get_input_text(day, case, source, input_name, seed, params or {})
+            except FileNotFoundError:
+                print("%02d missing %s" % (day, input_name))
+                break
+            results = bench_day(day, case, text, phases, repeat=repeat, timeout=timeout)
+            results.sort(key=lambda el: PHASES.index(el["phase"]))
+            for result in results:
+                print_measurement(result)
+            measurements.extend(results)
+    return measurements
+
+
+def _format_bytes(value: int | None) -> str:
+    if value is None:
+        return "-"
+    for unit in ["B", "KiB", "MiB"]:
+        if value < 1024:
+            return f"{value:.0f}{unit}"
+        value /= 1024
+    return f"{value:.1f}GiB"
+
+
+def _format_case(size: int | None, shape: Dict[str, int]) -> str:
+    label = "input" if size is None else str(size)
+    return " ".join([label] + [f"{name}={value}" for name, value in sorted(shape.items())])
+
+
+def print_measurement(measurement: Measurement) -> None:
+    case = _format_case(measurement["size"], measurement["shape"])
+    prefix = "%02d %-8s %-7s" % (measurement["day"], case, measurement["phase"])
+    if "error" in measurement:
+        print(f"{prefix} {measurement['error']}")
+    else:
+        print(
+            f"{prefix} median {measurement['median']:.4f}s  p95 {measurement['p95']:.4f}s  "
+            f"peak {_format_bytes(measurement['peak_bytes'])}"
+        )
+
+
+def _key(measurement: Measurement) -> Tuple[int, int | None, Tuple[Tuple[str, int], ...], str]:
+    # Results saved before the record length ladders have no shape
+    shape = tuple(sorted(measurement.get("shape", {}).items()))
+    return measurement["day"], measurement["size"], shape, measurement["phase"]
+
+
+def compare(old_path: str, new_path: str) -> None:
+    with open(old_path) as hand:
+        old = {_key(el): el for el in json.load(hand)["results"]}
+    with open(new_path) as hand:
+        new = {_key(el): el for el in json.load(hand)["results"]}
+    for key in sorted(set(old) & set(new), key=lambda el: (el[0], el[1] or 0, el[2], PHASES.index(el[3]))):
+        before, after = old[key], new[key]
+        day, size, shape, phase = key
+        size = _format_case(size, dict(shape))
+        if "median" not in before or "median" not in after:
+            print("%02d %-8s %-7s %s -> %s" % (day, size, phase, before.get("error", "ok"), after.get("error", "ok")))
+            continue
+        ratio = after["median"] / before["median"] if before["median"] > 0 else float("inf")
+        line = "%02d %-8s %-7s %.4fs -> %.4fs (x%.2f)" % (day, size, phase, before["median"], after["median"], ratio)
+        if before.get("peak_bytes") and after.get("peak_bytes") is not None:
+            peak_ratio = after["peak_bytes"] / before["peak_bytes"]
+            line += "  peak %s -> %s (x%.2f)" % (
+                _format_bytes(before["peak_bytes"]),
+                _format_bytes(after["peak_bytes"]),
+                peak_ratio,
+            )
+        print(line)
+
+
+def main(args: argparse.Namespace) -> None:
+    if args.compare is not None:
+        compare(*args.compare)
+        return
+    measurements = run_bench(
+        days.parse_days(args.days),
+        args.sizes,
+        repeat=args.repeat,
+        timeout=args.timeout,
+        source=args.source,
+        input_name=args.input,
+        seed=args.seed,
+        params=generators.parse_params(args.param),
+    )
+    if args.output is not None:
+        report = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+            "repeat": args.repeat,
+            "source": args.source,
+            "seed": args.seed,
+            "results": measurements,
+        }
+        with open(args.output, "w") as hand:
+            json.dump(report, hand, indent=1)
+
+
+def add_parser(subparsers: argparse._SubParsersAction) -> None:
+    parser = subparsers.add_parser("bench", help="benchmark parse/solve at increasing input sizes")
+    parser.add_argument("days", nargs="*", help="days to benchmark, e.g. 1 5 20-25 (default: all)")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        help="input sizes (default: a ladder for each day, and one of record lengths for some days)",
+    )
+    parser.add_argument(
+        "--source",
+        choices=["generate", "resample"],
+        default="generate",
+        help="generate synthetic inputs, or cycle through the records of the real input",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generated inputs")
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=VALUE", help="generator parameter")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs for each phase")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds allowed for each day and size")
+    parser.add_argument("--input", default="input", help="real input file name, used with --source resample")
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two saved result files")
+    parser.set_defaults(func=main)
@@ -0,0 +1,42 @@
+"""Counters of the work done in the hot loops of the solvers.
+
+The solvers count locally and only report their counts when `enabled` is set, checking the flag
+once outside of the loop, so the counters cost nothing when disabled:
+
+    counting = counters.enabled
+    for ...:
+        if counting:
+            popped += 1
+    if counting:
+        counters.add("states_popped", popped)
+
+Counting is enabled by the `--counters` flag of the runner or by the `AOC_COUNTERS` environment
+variable. Unlike timings the counts do not depend on the machine, so an algorithmic regression
+shows up as a change of the counts.
+"""
+import collections
+import os
+from typing import Dict
+
+ENV_VAR = "AOC_COUNTERS"
+
+enabled = os.environ.get(ENV_VAR, "") not in ("", "0")
+
+_counts: Dict[str, int] = collections.Counter()
+
+
+def enable(value: bool = True) -> None:
+    global enabled
+    enabled = value
+
+
+def add(name: str, value: int = 1) -> None:
+    _counts[name] += value
+
+
+def reset() -> None:
+    _counts.clear()
+
+
+def snapshot() -> Dict[str, int]:
+    return dict(_counts)
@@ -0,0 +1,56 @@
+import importlib.util
+import os
+import sys
+from types import ModuleType
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PARTS = {1: "solve1", 2: "solve2"}
+# Variants of the parts reading the input as they go, without a parse step
+STREAM_PARTS = {1: "stream1", 2: "stream2"}
+
+
+def get_day_dir(day: int) -> str:
+    return os.path.join(ROOT, "%02d" % day)
+
+
+def get_solution_path(day: int) -> str:
+    return os.path.join(get_day_dir(day), "solution.py")
+
+
+def list_days() -> List[int]:
+    days = []
+    for name in sorted(os.listdir(ROOT)):
+        if name.isdigit() and os.path.isfile(os.path.join(ROOT, name, "solution.py")):
+            days.append(int(name))
+    return days
+
+
+def parse_days(values: List[str]) -> List[int]:
+    if len(values) == 0:
+        return list_days()
+    selected = []
+    for value in values:
+        if "-" in value:
+            first, last = value.split("-", maxsplit=1)
+            selected.extend(range(int(first), int(last) + 1))
+        else:
+            selected.append(int(value))
+    return selected
+
+
+def load_module(day: int) -> ModuleType:
+    name = "day%02d" % day
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, get_solution_path(day))
+    module = importlib.util.module_from_spec(spec)
+    # Registered before execution so that dataclasses and pickle can resolve the module
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def get_parts(day: int) -> List[int]:
+    solver_cls = load_module(day).Solver
+    return [part for part, method in PARTS.items() if hasattr(solver_cls, method)]
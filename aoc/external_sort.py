@@ -0,0 +1,127 @@
+"""Sorting of integer sequences larger than the memory, through temporary files.
+
+The values are gathered in runs of a size given by the memory budget, each run is sorted and
+written to a temporary file as raw 64 bits integers, and the runs are merged back in a single
+sorted stream, reading each of them one block at a time. When there are too many runs for their
+blocks to fit in the budget they are first merged by groups into longer runs. Values that fit in
+a single run never touch the disk.
+
+The budget, in bytes, covers the values being sorted or merged, and defaults to the
+`AOC_MEMORY_BUDGET` environment variable:
+
+    with external_sort.ExternalSorter() as sorter:
+        sorter.extend(values)
+        for value in sorter.merge():
+            ...
+"""
+import heapq
+import os
+import tempfile
+from array import array
+from typing import Generator, Iterable, Iterator, List
+
+from aoc import reader
+
+ENV_VAR = "AOC_MEMORY_BUDGET"
+DEFAULT_BUDGET = 256 << 20
+
+# Bytes taken by each value while a run is sorted: in place with NumPy, otherwise the array, the
+# list given to `sorted`, the integer objects and the sorted list
+NUMPY_ITEM_SIZE = 8
+PYTHON_ITEM_SIZE = 56
+# Smallest number of values read at once from a run while merging
+MIN_BLOCK = 1 << 10
+
+
+def get_budget() -> int:
+    return int(os.environ.get(ENV_VAR, DEFAULT_BUDGET))
+
+
+def _read_run(path: str, block: int) -> Generator[int, None, None]:
+    with open(path, "rb") as hand:
+        while True:
+            values = array("q")
+            try:
+                values.fromfile(hand, block)
+            except EOFError:
+                # The values read before the end of the file are kept
+                pass
+            if len(values) == 0:
+                return
+            yield from values
+
+
+class ExternalSorter:
+
+    def __init__(self, budget: int | None = None, directory: str | None = None) -> None:
+        self.budget = budget if budget is not None else get_budget()
+        self.numpy = reader.get_numpy(self.budget)
+        item_size = NUMPY_ITEM_SIZE if self.numpy is not None else PYTHON_ITEM_SIZE
+        self.capacity = max(MIN_BLOCK, self.budget // item_size)
+        self.directory = directory
+        self.buffer = array("q")
+        self.runs: List[str] = []
+
+    def __enter__(self) -> "ExternalSorter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for path in self.runs:
+            os.remove(path)
+        self.runs = []
+        self.buffer = array("q")
+
+    def extend(self, values: Iterable[int]) -> None:
+        """Add the values, they must fit in 64 bits."""
+        self.buffer.extend(values)
+        while len(self.buffer) >= self.capacity:
+            # Only the values past the capacity are copied
+            rest = self.buffer[self.capacity :]
+            del self.buffer[self.capacity :]
+            self._write_run(self._sort(self.buffer))
+            self.buffer = rest
+
+    def _sort(self, values: array) -> array:
+        if self.numpy is not None:
+            self.numpy.frombuffer(values, dtype=self.numpy.int64).sort()
+            return values
+        return array("q", sorted(values))
+
+    def _write_run(self, values: Iterable[int]) -> None:
+        fd, path = tempfile.mkstemp(prefix="aoc-run-", suffix=".bin", dir=self.directory)
+        self.runs.append(path)
+        with os.fdopen(fd, "wb") as hand:
+            if isinstance(values, array):
+                values.tofile(hand)
+                return
+            block = array("q")
+            for value in values:
+                block.append(value)
+                if len(block) >= MIN_BLOCK:
+                    block.tofile(hand)
+                    block = array("q")
+            block.tofile(hand)
+
+    def _merge_runs(self, runs: List[str], block: int) -> Iterator[int]:
+        return heapq.merge(*[_read_run(path, block) for path in runs])
+
+    def merge(self) -> Iterator[int]:
+        """All the values added so far, in increasing order."""
+        if len(self.runs) == 0:
+            return iter(self._sort(self.buffer))
+        if len(self.buffer) > 0:
+            self._write_run(self._sort(self.buffer))
+            self.buffer = array("q")
+        # One block for each merged run, while merging by groups one more for the written run
+        fan_in = max(2, self.capacity // MIN_BLOCK - 1)
+        while len(self.runs) > fan_in:
+            runs, self.runs = self.runs, []
+            for start in range(0, len(runs), fan_in):
+                group = runs[start : start + fan_in]
+                self._write_run(self._merge_runs(group, self.capacity // (len(group) + 1)))
+                for path in group:
+                    os.remove(path)
+        return self._merge_runs(self.runs, self.capacity // len(self.runs))
@@ -0,0 +1,556 @@
+"""Seeded generators of valid puzzle inputs of arbitrary size.
+
+Every generator takes a `size`, whose meaning depends on the day (number of records, side of the
+grid, ...), a seeded `random.Random` and optional integer parameters, and yields the input lines.
+The grids are yielded row by row as they are built, keeping only a few rows in memory, so large
+inputs can be written straight to a file.
+"""
+import argparse
+import collections
+import contextlib
+import itertools
+import random
+import string
+import sys
+from typing import Callable, Dict, Generator, List, Tuple
+
+Lines = Generator[str, None, None]
+
+WALL = ord("#")
+SPACE = ord(".")
+
+
+def _grid(width: int, height: int, rng: random.Random, chars: str, weights: List[float]) -> Lines:
+    for _ in range(height):
+        yield "".join(rng.choices(chars, weights=weights, k=width))
+
+
+def _place(line: str, x: int, ch: str) -> str:
+    return line[:x] + ch + line[x + 1 :]
+
+
+def _find_set(parents: Dict[int, int], cell_set: int) -> int:
+    while parents.get(cell_set, cell_set) != cell_set:
+        parents[cell_set] = parents.get(parents[cell_set], parents[cell_set])
+        cell_set = parents[cell_set]
+    return cell_set
+
+
+def _eller_rows(cells: int, rng: random.Random) -> Generator[Tuple[List[bool], List[bool]], None, None]:
+    """Perfect maze of `cells` x `cells` cells built one row at a time with Eller's algorithm.
+
+    Yields for each row of cells whether each cell is open towards the next cell on its right, and
+    towards the cell below. Only the sets of cells connected through the rows above are kept.
+    """
+    sets: List[int | None] = [None] * cells
+    next_set = 0
+    for row in range(cells):
+        for column in range(cells):
+            if sets[column] is None:
+                sets[column] = next_set
+                next_set += 1
+        last = row == cells - 1
+        # The last row joins every set left, so that the maze is connected
+        right = [False] * cells
+        parents: Dict[int, int] = {}
+        for column in range(cells - 1):
+            first, second = _find_set(parents, sets[column]), _find_set(parents, sets[column + 1])
+            if first != second and (last or rng.random() < 0.5):
+                right[column] = True
+                parents[second] = first
+        sets = [_find_set(parents, cell_set) for cell_set in sets]
+        # Every set goes down through at least one of its cells
+        down = [False] * cells
+        if not last:
+            members = collections.defaultdict(list)
+            for column, cell_set in enumerate(sets):
+                members[cell_set].append(column)
+                down[column] = rng.random() < 0.5
+            for columns in members.values():
+                down[rng.choice(columns)] = True
+            sets = [cell_set if is_down else None for cell_set, is_down in zip(sets, down)]
+        yield right, down
+
+
+def _maze_rows(side: int, rng: random.Random) -> Generator[bytearray, None, None]:
+    """Perfect maze of `side` x `side`, odd, whose cells are at odd coordinates, row by row."""
+    cells = (side - 1) // 2
+    yield bytearray([WALL]) * side
+    for right, down in _eller_rows(cells, rng):
+        row = bytearray([WALL]) * side
+        below = bytearray([WALL]) * side
+        for column in range(cells):
+            row[2 * column + 1] = SPACE
+            if right[column]:
+                row[2 * column + 2] = SPACE
+            if down[column]:
+                below[2 * column + 1] = SPACE
+        yield row
+        yield below
+
+
+def _odd(size: int) -> int:
+    return max(5, size if size % 2 == 1 else size + 1)
+
+
+def generate_01(size: int, rng: random.Random, distinct: int = 90000) -> Lines:
+    """`size` pairs of location ids, drawn from `distinct` possible ids."""
+    for _ in range(size):
+        yield "%d   %d" % (rng.randrange(distinct) + 10000, rng.randrange(distinct) + 10000)
+
+
+def generate_02(size: int, rng: random.Random, length: int = 8) -> Lines:
+    """`size` reports of 5 to `length` levels, mostly monotone with a few bad levels."""
+    for _ in range(size):
+        direction = rng.choice((-1, 1))
+        level = rng.randint(1, 99)
+        report = []
+        for _ in range(rng.randint(min(5, length), length)):
+            report.append(level)
+            delta = rng.choices((1, 2, 3, 0, 5), weights=(30, 30, 30, 3, 3))[0]
+            level += direction * delta if rng.random() > 0.03 else -direction * delta
+        yield " ".join(str(el) for el in report)
+
+
+def generate_03(size: int, rng: random.Random) -> Lines:
+    """Corrupted memory of about `size` characters."""
+    tokens = ["mul(%d,%d)", "do()", "don't()", "mul(%d,%d]", "mul( %d,%d)", "mul(%d*%d)"]
+    noise = string.ascii_letters + string.punctuation + " "
+    produced = 0
+    chunk: List[str] = []
+    while produced < size:
+        if rng.random() < 0.1:
+            token = rng.choices(tokens, weights=(60, 10, 10, 5, 5, 5))[0]
+            if "%" in token:
+                token = token % (rng.randint(1, 999), rng.randint(1, 999))
+        else:
+            token = "".join(rng.choices(noise, k=rng.randint(1, 8)))
+        chunk.append(token)
+        produced += len(token)
+        if len(chunk) == 1000:
+            yield "".join(chunk)
+            chunk = []
+    yield "".join(chunk)
+
+
+def generate_04(size: int, rng: random.Random) -> Lines:
+    """Word search of `size` x `size` letters."""
+    yield from _grid(size, size, rng, "XMAS", [1, 1, 1, 1])
+
+
+def generate_05(size: int, rng: random.Random, pages: int = 49, length: int = 23) -> Lines:
+    """Ordering rules over `pages` pages, then `size` updates of up to `length` pages."""
+    order = list(range(10, 10 + pages))
+    rng.shuffle(order)
+    for i, before in enumerate(order):
+        for after in order[i + 1 :]:
+            yield "%d|%d" % (before, after)
+    yield ""
+    rank = {page: i for i, page in enumerate(order)}
+    longest = (min(length, pages) - 1) // 2
+    for _ in range(size):
+        n = 2 * rng.randint(min(2, longest), longest) + 1
+        update = rng.sample(order, n)
+        if rng.random() < 0.5:
+            update.sort(key=lambda el: rank[el])
+        yield ",".join(str(el) for el in update)
+
+
+def generate_06(size: int, rng: random.Random, density: int = 2) -> Lines:
+    """Lab of `size` x `size` with `density` percent obstacles and the guard facing up."""
+    x, y = rng.randrange(size), rng.randrange(size)
+    for row, line in enumerate(_grid(size, size, rng, "#.", [density, 100 - density])):
+        yield _place(line, x, "^") if row == y else line
+
+
+def generate_07(size: int, rng: random.Random, length: int = 12) -> Lines:
+    """`size` calibration equations of 2 to `length` values, about half of them solvable."""
+    for _ in range(size):
+        values = [rng.randint(1, 999) for _ in range(rng.randint(2, length))]
+        result = values[0]
+        for value in values[1:]:
+            op = rng.randrange(3)
+            if op == 0:
+                result += value
+            elif op == 1:
+                result *= value
+            else:
+                result = int(str(result) + str(value))
+        if rng.random() < 0.5:
+            result += rng.randint(1, 9)
+        yield "%d: %s" % (result, " ".join(str(el) for el in values))
+
+
+def generate_08(size: int, rng: random.Random, antennas: int = 4) -> Lines:
+    """City of `size` x `size` with about `antennas` antennas per frequency."""
+    frequencies = string.digits + string.ascii_letters
+    lines = [bytearray(b"." * size) for _ in range(size)]
+    for ch in frequencies[: max(1, size * size // (antennas * 50))]:
+        for _ in range(antennas):
+            lines[rng.randrange(size)][rng.randrange(size)] = ord(ch)
+    for line in lines:
+        yield line.decode()
+
+
+def generate_09(size: int, rng: random.Random) -> Lines:
+    """Disk map of `size` digits."""
+    size = size if size % 2 == 1 else size + 1
+    digits = [str(rng.randint(1, 9)) if i % 2 == 0 else str(rng.randint(0, 9)) for i in range(size)]
+    yield "".join(digits)
+
+
+def generate_10(size: int, rng: random.Random) -> Lines:
+    """Topographic map of `size` x `size` made of diagonal slopes with some noise."""
+    for y in range(size):
+        row = [str((x + y) % 10) if rng.random() > 0.2 else str(rng.randrange(10)) for x in range(size)]
+        yield "".join(row)
+
+
+def generate_11(size: int, rng: random.Random) -> Lines:
+    """`size` stones."""
+    yield " ".join(str(rng.randrange(1000000)) for _ in range(size))
+
+
+def generate_12(size: int, rng: random.Random, region: int = 4) -> Lines:
+    """Garden of `size` x `size` with blocky regions of about `region` plots per side."""
+    letters = string.ascii_uppercase
+    blocks = (size + region - 1) // region
+    block_rows = [[rng.choice(letters) for _ in range(blocks)] for _ in range(blocks)]
+    for y in range(size):
+        row = []
+        for x in range(size):
+            if rng.random() < 0.1:
+                bx, by = min(blocks - 1, (x + 1) // region), min(blocks - 1, (y + 1) // region)
+            else:
+                bx, by = x // region, y // region
+            row.append(block_rows[by][bx])
+        yield "".join(row)
+
+
+def generate_13(size: int, rng: random.Random) -> Lines:
+    """`size` claw machines, about half of them winnable in part 1."""
+    for i in range(size):
+        while True:
+            ax, ay, bx, by = (rng.randint(10, 99) for _ in range(4))
+            if ax * by != ay * bx:
+                break
+        if rng.random() < 0.5:
+            a, b = rng.randint(0, 100), rng.randint(0, 100)
+            px, py = a * ax + b * bx, a * ay + b * by
+        else:
+            px, py = rng.randint(1000, 20000), rng.randint(1000, 20000)
+        if i > 0:
+            yield ""
+        yield "Button A: X+%d, Y+%d" % (ax, ay)
+        yield "Button B: X+%d, Y+%d" % (bx, by)
+        yield "Prize: X=%d, Y=%d" % (px, py)
+
+
+def generate_14(size: int, rng: random.Random, width: int = 101, height: int = 103) -> Lines:
+    """`size` robots, all on distinct tiles at some point in time so that part 2 terminates."""
+    if size > width * height:
+        raise ValueError(f"At most {width * height} robots fit in the room")
+    seconds = rng.randint(1, width * height - 1)
+    targets = rng.sample(range(width * height), size)
+    for target in targets:
+        tx, ty = target % width, target // width
+        vx, vy = rng.randint(-width + 1, width - 1), rng.randint(-height + 1, height - 1)
+        px, py = (tx - seconds * vx) % width, (ty - seconds * vy) % height
+        yield "p=%d,%d v=%d,%d" % (px, py, vx, vy)
+
+
+def generate_15(size: int, rng: random.Random, moves: int = 0) -> Lines:
+    """Warehouse of `size` x `size`, followed by `moves` moves (default 20 per tile of side)."""
+    moves = moves if moves > 0 else 20 * size
+    x, y = rng.randint(1, size - 2), rng.randint(1, size - 2)
+    yield "#" * size
+    for row in range(1, size - 1):
+        line = "#" + "".join(rng.choices("#O.", weights=(5, 30, 65), k=size - 2)) + "#"
+        yield _place(line, x, "@") if row == y else line
+    yield "#" * size
+    yield ""
+    for start in range(0, moves, 1000):
+        yield "".join(rng.choices("^v<>", k=min(1000, moves - start)))
+
+
+def generate_16(size: int, rng: random.Random, loops: int = 10) -> Lines:
+    """Maze of `size` x `size` with `loops` percent of the inner walls removed."""
+    side = _odd(size)
+    for y, row in enumerate(_maze_rows(side, rng)):
+        if 0 < y < side - 1:
+            for x in range(1, side - 1):
+                # Walls between two cells, not the corners between four of them
+                if row[x] == WALL and (x % 2 == 1 or y % 2 == 1) and rng.randrange(100) < loops:
+                    row[x] = SPACE
+        if y == 1:
+            row[side - 2] = ord("E")
+        if y == side - 2:
+            row[1] = ord("S")
+        yield row.decode()
+
+
+def _first_output(a: int, x: int, y: int) -> int:
+    b = (a % 8) ^ x
+    c = a >> b
+    return (b ^ y ^ c) % 8
+
+
+def generate_17(size: int, rng: random.Random) -> Lines:
+    """Self replicating program, register A has `size` octal digits."""
+    while True:
+        x, y = rng.randrange(8), rng.randrange(8)
+        program = [2, 4, 1, x, 7, 5, 1, y, 4, 0, 0, 3, 5, 5, 3, 0]
+        valid_a = [0]
+        for target in reversed(program):
+            valid_a = [a * 8 + j for a in valid_a for j in range(8) if _first_output(a * 8 + j, x, y) == target]
+        if len(valid_a) > 0:
+            break
+    yield "Register A: %d" % rng.randrange(8 ** (size - 1), 8**size)
+    yield "Register B: 0"
+    yield "Register C: 0"
+    yield ""
+    yield "Program: %s" % ",".join(str(el) for el in program)
+
+
+def _is_reachable(width: int, height: int, occupied: set) -> bool:
+    border = collections.deque([(0, 0)])
+    seen = {(0, 0)}
+    while len(border) > 0:
+        x, y = border.popleft()
+        if (x, y) == (width - 1, height - 1):
+            return True
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if 0 <= nx < width and 0 <= ny < height and (nx, ny) not in seen and (nx, ny) not in occupied:
+                seen.add((nx, ny))
+                border.append((nx, ny))
+    return False
+
+
+def generate_18(size: int, rng: random.Random, width: int = 71, height: int = 71, first: int = 1024) -> Lines:
+    """`size` falling bytes, the exit is still reachable after the `first` of them."""
+    cells = [(x, y) for y in range(height) for x in range(width)][1:-1]
+    if size > len(cells):
+        raise ValueError(f"At most {len(cells)} bytes fit in the memory space")
+    while True:
+        rng.shuffle(cells)
+        if _is_reachable(width, height, set(cells[: min(first, size)])):
+            break
+    for x, y in cells[:size]:
+        yield "%d,%d" % (x, y)
+
+
+def generate_19(size: int, rng: random.Random, patterns: int = 400) -> Lines:
+    """`patterns` towel patterns, then `size` designs of which about half can be made."""
+    colors = "wubrg"
+    # One color has no single stripe towel, otherwise every design could be made
+    missing = rng.choice(colors)
+    towels = {"".join(rng.choices(colors, k=rng.randint(1, 8))) for _ in range(patterns)}
+    towels = sorted(towels - {missing})
+    yield ", ".join(towels)
+    yield ""
+    for _ in range(size):
+        if rng.random() < 0.5:
+            design = ""
+            while len(design) < 20:
+                design += rng.choice(towels)
+            yield design[:60]
+        else:
+            yield "".join(rng.choices(colors, k=rng.randint(20, 60)))
+
+
+def generate_20(size: int, rng: random.Random) -> Lines:
+    """Single track race of `size` x `size`, going back and forth from the bottom left to the top right.
+
+    The track runs along every odd row, between the columns where it comes from the row above and
+    where it goes down to the row below, chosen at random.
+    """
+    side = _odd(size)
+    cells = (side - 1) // 2
+    yield "#" * side
+    previous = cells - 1
+    for row in range(cells):
+        turn = rng.randrange(cells) if row < cells - 1 else 0
+        low, high = sorted((previous, turn))
+        line = bytearray([WALL]) * side
+        line[2 * low + 1 : 2 * high + 2] = bytes([SPACE]) * (2 * (high - low) + 1)
+        if row == 0:
+            line[side - 2] = ord("E")
+        if row == cells - 1:
+            line[1] = ord("S")
+        yield line.decode()
+        below = bytearray([WALL]) * side
+        if row < cells - 1:
+            below[2 * turn + 1] = SPACE
+        yield below.decode()
+        previous = turn
+
+
+def generate_21(size: int, rng: random.Random) -> Lines:
+    """`size` door codes."""
+    for _ in range(size):
+        yield "%03dA" % rng.randrange(1000)
+
+
+def generate_22(size: int, rng: random.Random) -> Lines:
+    """`size` buyers' initial secret numbers."""
+    for _ in range(size):
+        yield str(rng.randint(1, 16777215))
+
+
+def _computer_names() -> Generator[str, None, None]:
+    for length in itertools.count(2):
+        for letters in itertools.product(string.ascii_lowercase, repeat=length):
+            yield "".join(letters)
+
+
+def generate_23(size: int, rng: random.Random, degree: int = 13) -> Lines:
+    """Network of `size` computers with about `degree` links each and one LAN party of `degree`."""
+    names = rng.sample(list(itertools.islice(_computer_names(), max(size, 26 * 26))), size)
+    edges = set()
+    party = names[: min(size, degree)]
+    for i, a in enumerate(party):
+        for b in party[i + 1 :]:
+            edges.add((a, b))
+    for a in names:
+        for b in rng.sample(names, min(size, degree // 2)):
+            if a != b and (b, a) not in edges:
+                edges.add((a, b))
+    edges = list(edges)
+    rng.shuffle(edges)
+    for a, b in edges:
+        yield "%s-%s" % (a, b)
+
+
+def _gate_names() -> Generator[str, None, None]:
+    letters = [ch for ch in string.ascii_lowercase if ch not in "xyz"]
+    for name in itertools.product(letters, repeat=3):
+        yield "".join(name)
+
+
+def generate_24(size: int, rng: random.Random, swaps: int = 4) -> Lines:
+    """Ripple carry adder of `size` bits with `swaps` pairs of swapped outputs."""
+    # The wires are numbered with two digits, the carry out of the last bit included
+    if not 1 <= size <= 99:
+        raise ValueError("The adder has from 1 to 99 bits")
+    names = list(itertools.islice(_gate_names(), 5 * size))
+    rng.shuffle(names)
+    names = iter(names)
+    gates = [("x00", "XOR", "y00", "z00")]
+    carry = next(names)
+    gates.append(("x00", "AND", "y00", carry))
+    bits: List[Tuple[int, int]] = []
+    for i in range(1, size):
+        partial, direct, through = next(names), next(names), next(names)
+        next_carry = next(names) if i < size - 1 else "z%02d" % size
+        gates.append(("x%02d" % i, "XOR", "y%02d" % i, partial))
+        gates.append(("x%02d" % i, "AND", "y%02d" % i, direct))
+        gates.append((partial, "XOR", carry, "z%02d" % i))
+        gates.append((partial, "AND", carry, through))
+        gates.append((direct, "OR", through, next_carry))
+        # Indices of the partial sum, direct carry and output gate of this bit
+        bits.append((len(gates) - 5, len(gates) - 4, len(gates) - 3))
+        carry = next_carry
+    # Swaps are local to one bit and not on consecutive bits, as in the original puzzle
+    candidates = [bit for i, bit in enumerate(bits) if i % 2 == 0 and i + 2 < size - 2]
+    for partial, direct, output in rng.sample(candidates, min(swaps, len(candidates))):
+        first, second = rng.choice(((partial, direct), (output, direct), (output, partial + 3)))
+        a, b = gates[first], gates[second]
+        gates[first], gates[second] = a[:3] + (b[3],), b[:3] + (a[3],)
+    for prefix in "xy":
+        for i in range(size):
+            yield "%s%02d: %d" % (prefix, i, rng.randrange(2))
+    yield ""
+    rng.shuffle(gates)
+    for a, op, b, target in gates:
+        yield "%s %s %s -> %s" % (a, op, b, target)
+
+
+def generate_25(size: int, rng: random.Random) -> Lines:
+    """`size` schematics, half locks and half keys."""
+    for i in range(size):
+        is_lock = i % 2 == 0
+        heights = [rng.randint(0, 5) for _ in range(5)]
+        if i > 0:
+            yield ""
+        for row in range(7):
+            level = row if is_lock else 6 - row
+            yield "".join("#" if level <= height else "." for height in heights)
+
+
+GENERATORS: Dict[int, Callable[..., Lines]] = {
+    int(name[len("generate_") :]): function
+    for name, function in list(globals().items())
+    if name.startswith("generate_")
+}
+
+# Default benchmark sizes for each day, in the units of its generator
+LADDERS: Dict[int, List[int]] = {
+    1: [1000, 10000, 100000],
+    2: [1000, 10000, 100000],
+    3: [10000, 100000, 1000000],
+    4: [50, 100, 200],
+    5: [100, 1000, 10000],
+    6: [20, 40, 80],
+    7: [100, 1000, 10000],
+    8: [50, 100, 200],
+    9: [1000, 10000, 100000],
+    10: [50, 100, 200],
+    11: [10, 100, 1000],
+    12: [50, 100, 200],
+    13: [100, 1000, 10000],
+    14: [100, 300, 1000],
+    15: [20, 40, 80],
+    16: [21, 41, 81],
+    17: [8, 16, 32],
+    18: [1100, 2000, 4000],
+    19: [100, 1000, 10000],
+    20: [21, 41, 81],
+    21: [5, 50, 500],
+    22: [100, 1000, 10000],
+    23: [100, 300, 1000],
+    24: [24, 45, 90],
+    25: [100, 1000, 10000],
+}
+
+
+# Generator parameters grown at a fixed size for the days whose cost grows with the length of each
+# record, as the ladders above only add records
+SHAPE_LADDERS: Dict[int, Tuple[int, List[Dict[str, int]]]] = {
+    2: (1000, [{"length": 8}, {"length": 100}, {"length": 1000}]),
+    5: (100, [{"pages": 49, "length": 23}, {"pages": 150, "length": 101}, {"pages": 400, "length": 399}]),
+}
+
+
+def generate(day: int, size: int, seed: int = 0, **params: int) -> Lines:
+    return GENERATORS[day](size, random.Random(seed), **params)
+
+
+def generate_text(day: int, size: int, seed: int = 0, **params: int) -> str:
+    return "".join(line + "\n" for line in generate(day, size, seed=seed, **params))
+
+
+def parse_params(values: List[str]) -> Dict[str, int]:
+    params = {}
+    for value in values:
+        key, number = value.split("=", maxsplit=1)
+        params[key] = int(number)
+    return params
+
+
+def main(args: argparse.Namespace) -> None:
+    lines = generate(args.day, args.size, seed=args.seed, **parse_params(args.param))
+    # The standard output stays open for the rest of the process
+    with open(args.output, "w") if args.output is not None else contextlib.nullcontext(sys.stdout) as hand:
+        for line in lines:
+            hand.write(line)
+            hand.write("\n")
+
+
+def add_parser(subparsers: argparse._SubParsersAction) -> None:
+    parser = subparsers.add_parser("generate", help="write a synthetic input of the given size")
+    parser.add_argument("day", type=int, choices=sorted(GENERATORS))
+    parser.add_argument("size", type=int, help="size of the input, see the generator of the day")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=VALUE", help="generator parameter")
+    parser.add_argument("--output", help="file to write (default: standard output)")
+    parser.set_defaults(func=main)
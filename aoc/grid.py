@@ -0,0 +1,116 @@
+"""Rectangular maps stored row by row in a flat bytearray.
+
+Cells are addressed by their flat index and hold one byte, usually the character of the input.
+The map is surrounded by a one cell border holding `BORDER`: the neighbours of any cell of the map
+are valid indices, so bounds checks become a comparison with `BORDER`.
+"""
+from typing import Generator, Iterable, Tuple
+
+BORDER = 0
+
+
+class Grid:
+
+    def __init__(self, width: int, height: int, fill: int = ord("."), data: bytearray | None = None) -> None:
+        self.width = width
+        self.height = height
+        self.stride = width + 2
+        if data is None:
+            data = bytearray([BORDER]) * (self.stride * (height + 2))
+            row = bytes([fill]) * width
+            for y in range(height):
+                start = self.index(0, y)
+                data[start : start + width] = row
+        self.data = data
+        self.up = -self.stride
+        self.down = self.stride
+        self.left = -1
+        self.right = 1
+        # Clockwise, starting upwards
+        self.directions = (self.up, self.right, self.down, self.left)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "Grid":
+        """Read the map from the lines, stopping at the first empty line."""
+        rows = []
+        for line in lines:
+            line = line.strip()
+            if line == "":
+                break
+            rows.append(line.encode())
+        grid = cls(len(rows[0]), len(rows))
+        for y, row in enumerate(rows):
+            start = grid.index(0, y)
+            grid.data[start : start + grid.width] = row
+        return grid
+
+    def index(self, x: int, y: int) -> int:
+        return (y + 1) * self.stride + x + 1
+
+    def coords(self, idx: int) -> Tuple[int, int]:
+        y, x = divmod(idx, self.stride)
+        return x - 1, y - 1
+
+    def offset(self, dx: int, dy: int) -> int:
+        return dy * self.stride + dx
+
+    def contains(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def __getitem__(self, idx: int) -> int:
+        return self.data[idx]
+
+    def __setitem__(self, idx: int, value: int) -> None:
+        self.data[idx] = value
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def get(self, x: int, y: int) -> int:
+        return self.data[self.index(x, y)]
+
+    def row(self, y: int) -> memoryview:
+        """View of a row of the map, without copying it."""
+        start = self.index(0, y)
+        return memoryview(self.data)[start : start + self.width]
+
+    def lines(self, dx: int, dy: int) -> Generator[Tuple[int, bytes], None, None]:
+        """Every line of the map along the unit direction, with the index of its first cell."""
+        step = self.offset(dx, dy)
+        # A line starts on the cells whose previous cell along the direction is in the border
+        starts = []
+        if dy != 0:
+            y = 0 if dy > 0 else self.height - 1
+            starts.extend((x, y) for x in range(self.width))
+        if dx != 0:
+            x = 0 if dx > 0 else self.width - 1
+            starts.extend((x, y) for y in range(self.height))
+        for x, y in dict.fromkeys(starts):
+            lengths = []
+            if dx != 0:
+                lengths.append(self.width - x if dx > 0 else x + 1)
+            if dy != 0:
+                lengths.append(self.height - y if dy > 0 else y + 1)
+            start = self.index(x, y)
+            # The cell after the line is in the border, so the slice never wraps around
+            yield start, bytes(self.data[start : start + min(lengths) * step : step])
+
+    def indices(self) -> Generator[int, None, None]:
+        for y in range(self.height):
+            start = self.index(0, y)
+            yield from range(start, start + self.width)
+
+    def find(self, value: int) -> int:
+        return self.data.find(value)
+
+    def find_all(self, value: int) -> Generator[int, None, None]:
+        idx = self.data.find(value)
+        while idx != -1:
+            yield idx
+            idx = self.data.find(value, idx + 1)
+
+    def copy(self) -> "Grid":
+        return Grid(self.width, self.height, data=self.data.copy())
+
+    def __str__(self) -> str:
+        return "\n".join(self.row(y).tobytes().decode() for y in range(self.height))
@@ -0,0 +1,31 @@
+"""Results shared between the parts of a solver.
+
+Methods decorated with `memoized` compute their result once per solver and arguments, the
+following calls, from the same part or from the other one, return the stored result. The results
+are stored on the solver itself and live as long as it does, `clear` drops them, e.g. when the
+state they were computed from changes. The stored results are shared: callers must not modify them.
+"""
+import functools
+from typing import Any, Callable, TypeVar
+
+STORE_ATTRIBUTE = "_memo"
+
+Method = TypeVar("Method", bound=Callable[..., Any])
+
+
+def memoized(method: Method) -> Method:
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self: Any, *args: Any) -> Any:
+        store = self.__dict__.setdefault(STORE_ATTRIBUTE, {})
+        key = (name, args)
+        if key not in store:
+            store[key] = method(self, *args)
+        return store[key]
+
+    return wrapper
+
+
+def clear(obj: Any) -> None:
+    obj.__dict__.pop(STORE_ATTRIBUTE, None)
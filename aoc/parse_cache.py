@@ -0,0 +1,99 @@
+"""Cache of parsed inputs, stored next to the input file.
+
+The state built by `Solver.parse` is pickled to `<input>.<hash>-<version>.parsed`, where the hash is
+taken over the content of the input and the version identifies the parser. A solver can pin its
+parser version with a `PARSER_VERSION` class attribute, otherwise any change to its source file
+invalidates the cache. Any change to the sources of the `aoc` package, which hold the shared readers
+and the pickled types such as `Grid`, invalidates it as well.
+"""
+import contextlib
+import glob
+import hashlib
+import os
+import pickle
+import sys
+from typing import Any
+
+CACHE_SUFFIX = ".parsed"
+BLOCK_SIZE = 1 << 20
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as hand:
+        while block := hand.read(BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_package() -> str:
+    """Hash of the sources of the `aoc` package, shared by the solutions."""
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(PACKAGE_DIR, "*.py"))):
+        digest.update(f"{os.path.basename(path)}:{hash_file(path)}\n".encode())
+    return digest.hexdigest()
+
+
+def get_parser_version(solver: Any) -> str:
+    version = getattr(solver, "PARSER_VERSION", None)
+    if version is None:
+        version = hash_file(sys.modules[type(solver).__module__].__file__)
+    return hashlib.sha256(f"{version}-{hash_package()}".encode()).hexdigest()[:16]
+
+
+def get_cache_path(solver: Any, path: str) -> str:
+    return f"{path}.{hash_file(path)[:16]}-{get_parser_version(solver)}{CACHE_SUFFIX}"
+
+
+def dump_state(solver: Any) -> bytes | None:
+    """Serialized state of the solver, None when it cannot be serialized."""
+    try:
+        return pickle.dumps(solver.__dict__, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        # Some state, like open files, cannot be cached
+        return None
+
+
+def load_state(solver: Any, data: bytes) -> None:
+    solver.__dict__.update(pickle.loads(data))
+
+
+def _load(solver: Any, cache_path: str) -> bool:
+    try:
+        with open(cache_path, "rb") as hand:
+            load_state(solver, hand.read())
+    except FileNotFoundError:
+        return False
+    except Exception:
+        # Unreadable or written by an incompatible version of the code, parse again
+        return False
+    return True
+
+
+def _store(solver: Any, path: str, cache_path: str) -> None:
+    data = dump_state(solver)
+    if data is None:
+        return
+    for stale in glob.glob(glob.escape(path) + ".*" + CACHE_SUFFIX):
+        if stale != cache_path:
+            # The other part of the day may be removing it at the same time
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(stale)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as hand:
+        hand.write(data)
+    os.replace(tmp_path, cache_path)
+
+
+def parse(solver: Any, path: str) -> bool:
+    """Parse the input with the solver, reusing the cached state when possible.
+
+    Returns True when the state was loaded from the cache.
+    """
+    cache_path = get_cache_path(solver, path)
+    if _load(solver, cache_path):
+        return True
+    solver.parse(path)
+    _store(solver, path, cache_path)
+    return False
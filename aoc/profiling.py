@@ -0,0 +1,130 @@
+"""Opt-in profiling of the parse and solve phases.
+
+Profiling is enabled by the `--profile` flag of the runner or by the `AOC_PROFILE` environment
+variable, both taking a comma separated list of tools:
+
+- `time`: wall and CPU duration of each phase, always measured
+- `cprofile`: the functions where most of the time is spent, with `cProfile`
+- `memory`: peak of the memory allocated during the phase, with `tracemalloc`
+
+`all` (or `1`) enables every tool. The number of hot functions reported is set by `AOC_PROFILE_TOP`.
+The tools slow down the code they measure, so durations are only comparable between runs using
+the same tools.
+"""
+import contextlib
+import cProfile
+import os
+import pstats
+import time
+import tracemalloc
+from typing import Dict, Any, Generator, List
+
+from aoc import days
+
+ENV_VAR = "AOC_PROFILE"
+TOP_ENV_VAR = "AOC_PROFILE_TOP"
+OUTPUT_ENV_VAR = "AOC_PROFILE_OUTPUT"
+TOOLS = ("time", "cprofile", "memory")
+DEFAULT_TOP = 10
+DEFAULT_OUTPUT = "profile.json"
+
+Record = Dict[str, Any]
+
+
+def parse_tools(value: str | None) -> List[str]:
+    """Tools named in `value`, an empty list when profiling is disabled."""
+    if value is None or value.strip() in ("", "0"):
+        return []
+    if value.strip() in ("1", "all"):
+        return list(TOOLS)
+    tools = ["time"]
+    for tool in value.split(","):
+        tool = tool.strip()
+        if tool not in TOOLS:
+            raise ValueError(f"Unknown profiling tool {tool!r}, expected one of {', '.join(TOOLS)}")
+        if tool not in tools:
+            tools.append(tool)
+    return tools
+
+
+def get_env_tools() -> List[str]:
+    return parse_tools(os.environ.get(ENV_VAR))
+
+
+def get_env_top() -> int:
+    return int(os.environ.get(TOP_ENV_VAR, DEFAULT_TOP))
+
+
+def get_env_output() -> str:
+    return os.environ.get(OUTPUT_ENV_VAR, DEFAULT_OUTPUT)
+
+
+def _function_name(key: tuple) -> str:
+    filename, line, name = key
+    if filename.startswith(days.ROOT):
+        filename = os.path.relpath(filename, days.ROOT)
+    if line == 0:
+        # Built-in functions have no location
+        return name
+    return f"{filename}:{line}({name})"
+
+
+def _is_profiler(key: tuple) -> bool:
+    filename, _, name = key
+    return filename == __file__ or "_lsprof" in name
+
+
+def get_hot_functions(profile: cProfile.Profile, top: int) -> List[Record]:
+    """Functions with the most time spent in their own code, excluding the functions they call."""
+    stats = pstats.Stats(profile).stats
+    stats = {key: value for key, value in stats.items() if not _is_profiler(key)}
+    hot = sorted(stats.items(), key=lambda el: el[1][2], reverse=True)[:top]
+    return [
+        {
+            "function": _function_name(key),
+            "calls": calls,
+            "total_time": total_time,
+            "cumulative_time": cumulative_time,
+        }
+        for key, (_, calls, total_time, cumulative_time, _) in hot
+    ]
+
+
+class Profiler:
+
+    def __init__(self, tools: List[str], top: int = DEFAULT_TOP) -> None:
+        self.tools = tools
+        self.top = top
+        self.records: List[Record] = []
+
+    @property
+    def enabled(self) -> bool:
+        return len(self.tools) > 0
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        """Measure the code run inside the block, when profiling is enabled."""
+        if not self.enabled:
+            yield
+            return
+        record: Record = {"phase": name}
+        profile = cProfile.Profile() if "cprofile" in self.tools else None
+        memory = "memory" in self.tools
+        if memory:
+            tracemalloc.start()
+        wall, cpu = time.perf_counter(), time.process_time()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            record["duration"] = time.perf_counter() - wall
+            record["cpu"] = time.process_time() - cpu
+            if memory:
+                record["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            if profile is not None:
+                record["hot_functions"] = get_hot_functions(profile, self.top)
+            self.records.append(record)
@@ -0,0 +1,258 @@
+"""Bulk readers of the integers of an input.
+
+The file is memory mapped and every byte that cannot be part of an integer is turned into a
+separator, so `p=0,4 v=3,-3` reads as `0 4 3 -3`, and a sign after a digit starts a new integer, so
+`5-3` reads as `5 -3`. The integers are parsed all at once, by NumPy when it is installed and the
+input is large enough to pay for its import, and returned in an `array` of 64 bits integers that
+NumPy can wrap without copy (`numpy.frombuffer(values, dtype=numpy.int64)`). Integers that do not
+fit in 64 bits are returned in a list instead.
+
+The `iter_*` variants read the file one block at a time and yield one record at a time, so that a
+solver can handle each record as it is read, with a memory use that does not depend on the size of
+the input.
+"""
+import contextlib
+import itertools
+import mmap
+import operator
+import re
+import sys
+from array import array
+from types import ModuleType
+from typing import Generator, List, Sequence, Tuple
+
+INT64_MIN = -(1 << 63)
+INT64_MAX = (1 << 63) - 1
+
+SPACE = ord(" ")
+NEWLINE = ord("\n")
+MINUS = ord("-")
+ZERO = ord("0")
+# Longest integers parsed by NumPy, longer ones may not fit in 64 bits
+MAX_NUMPY_DIGITS = 18
+
+# Digits and signs are kept, new lines too for the layouts with one record per line
+_KEEP_LINES = bytes(c if c in b"-0123456789\n" else SPACE for c in range(256))
+_FLAT = bytes(c if c in b"-0123456789" else SPACE for c in range(256))
+_INT = re.compile(rb"-?[0-9]+")
+# Signs that are not at the start of an integer, the pattern starts with the sign so that the
+# search can skip to the next one
+_INNER_SIGN = re.compile(rb"-(?:(?<=[0-9-]-)|(?![0-9]))")
+
+# Below this size the import of NumPy takes longer than parsing without it
+NUMPY_MIN_SIZE = 1 << 16
+STREAM_BLOCK_SIZE = 1 << 20
+
+Ints = Sequence[int]
+
+
+def get_numpy(size: int) -> ModuleType | None:
+    """NumPy, when it is installed and `size` is large enough to pay for its import."""
+    if size < NUMPY_MIN_SIZE:
+        return None
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+@contextlib.contextmanager
+def map_file(path: str) -> Generator[bytes, None, None]:
+    with open(path, "rb") as hand:
+        try:
+            data = mmap.mmap(hand.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            yield b""
+            return
+        with data:
+            yield data
+
+
+def _to_array(values: List[int]) -> Ints:
+    try:
+        return array("q", values)
+    except OverflowError:
+        return values
+
+
+def _split_ints(text: bytes) -> List[bytes]:
+    """The integers of the translated text, as bytes."""
+    if _INNER_SIGN.search(text) is None:
+        return text.split()
+    return _INT.findall(text)
+
+
+def _token_bounds(buffer: "numpy.ndarray") -> Tuple["numpy.ndarray", "numpy.ndarray"]:
+    """Start and end positions of the tokens of the translated text."""
+    is_token = (buffer != SPACE) & (buffer != NEWLINE)
+    starts = is_token.copy()
+    starts[1:] &= ~is_token[:-1]
+    ends = is_token
+    ends[:-1] &= ~is_token[1:]
+    return starts.nonzero()[0], ends.nonzero()[0] + 1
+
+
+def _parse_numpy(numpy: ModuleType, text: bytes, starts: "numpy.ndarray", ends: "numpy.ndarray") -> Ints | None:
+    """Integers of the tokens between `starts` and `ends` in the text, None if some are not integers."""
+    if _INNER_SIGN.search(text) is not None:
+        return None
+    if len(starts) == 0:
+        return array("q")
+    buffer = numpy.frombuffer(text, dtype=numpy.uint8)
+    negative = buffer[starts] == MINUS
+    lengths = ends - starts - negative
+    shortest = int(lengths.min())
+    # The digits are added from the last one of every integer, one position at a time
+    values = numpy.zeros(len(starts), dtype=numpy.int64)
+    digits = numpy.empty(len(starts), dtype=numpy.int64)
+    positions = ends - 1
+    scale = 1
+    for position in range(min(int(lengths.max()), MAX_NUMPY_DIGITS)):
+        numpy.subtract(buffer.take(positions), ZERO, out=digits, dtype=numpy.int64, casting="unsafe")
+        if position >= shortest:
+            digits[lengths <= position] = 0
+        digits *= scale
+        values += digits
+        positions -= 1
+        scale *= 10
+    values[negative] *= -1
+    long_values = numpy.flatnonzero(lengths > MAX_NUMPY_DIGITS)
+    if len(long_values) == 0:
+        return array("q", values.tobytes())
+    values_list = values.tolist()
+    for idx in long_values.tolist():
+        values_list[idx] = int(_INT.match(text, int(starts[idx])).group())
+    return _to_array(values_list)
+
+
+def parse_ints(data: bytes) -> Ints:
+    """All the integers of the data, in order."""
+    text = data[:].translate(_FLAT)
+    numpy = get_numpy(len(text))
+    if numpy is not None:
+        values = _parse_numpy(numpy, text, *_token_bounds(numpy.frombuffer(text, dtype=numpy.uint8)))
+        if values is not None:
+            return values
+    return _to_array(list(map(int, _split_ints(text))))
+
+
+def parse_ragged_ints(data: bytes) -> Tuple[Ints, Ints]:
+    """All the integers of the data and the offsets of the lines in them.
+
+    The integers of line `i` are `values[offsets[i] : offsets[i + 1]]`, lines without integers are
+    skipped.
+    """
+    text = data[:].translate(_KEEP_LINES)
+    numpy = get_numpy(len(text))
+    if numpy is not None:
+        buffer = numpy.frombuffer(text, dtype=numpy.uint8)
+        tokens, token_ends = _token_bounds(buffer)
+        newlines = numpy.flatnonzero(buffer == NEWLINE)
+        # Number of integers before the end of each line, the last line may not end with a new line
+        ends = numpy.searchsorted(tokens, newlines)
+        bounds = numpy.concatenate(([0], ends, [len(tokens)])).astype(numpy.int64)
+        # Lines without integers end where the previous line ended
+        offsets = bounds[numpy.concatenate(([True], bounds[1:] != bounds[:-1]))]
+        values = _parse_numpy(numpy, text, tokens, token_ends)
+        if values is not None:
+            return values, array("q", offsets.tobytes())
+    counts = [len(_split_ints(line)) for line in text.split(b"\n")]
+    offsets_list = list(itertools.accumulate((count for count in counts if count > 0), initial=0))
+    return _to_array(list(map(int, _split_ints(text)))), array("q", offsets_list)
+
+
+def read_ints(path: str) -> Ints:
+    with map_file(path) as data:
+        return parse_ints(data)
+
+
+def read_int_rows(path: str, n: int) -> Ints:
+    """Integers of a file with `n` integers per line, flattened: row `i` is `values[i * n : (i + 1) * n]`."""
+    values = read_ints(path)
+    if len(values) % n != 0:
+        raise ValueError(f"Expected {n} integers per line in {path}, got {len(values)} integers in total")
+    return values
+
+
+def read_ragged_ints(path: str) -> Tuple[Ints, Ints]:
+    """Integers of a file with any number of integers per line, see `parse_ragged_ints`."""
+    with map_file(path) as data:
+        return parse_ragged_ints(data)
+
+
+def read_key_values(path: str) -> Tuple[Ints, Ints, Ints]:
+    """Keys, values and offsets of a file made of `key: value value ...` lines.
+
+    The values of the line with key `keys[i]` are `values[offsets[i] : offsets[i + 1]]`.
+    """
+    values, offsets = read_ragged_ints(path)
+    # Already imported when the input was large enough
+    numpy = sys.modules.get("numpy")
+    if numpy is not None and isinstance(values, array) and len(values) >= NUMPY_MIN_SIZE:
+        np_values = numpy.frombuffer(values, dtype=numpy.int64)
+        np_offsets = numpy.frombuffer(offsets, dtype=numpy.int64)
+        is_key = numpy.zeros(len(np_values), dtype=bool)
+        is_key[np_offsets[:-1]] = True
+        # Each line before the current one had one key removed
+        rest_offsets = np_offsets - numpy.arange(len(np_offsets))
+        return (
+            array("q", np_values[is_key].tobytes()),
+            array("q", np_values[~is_key].tobytes()),
+            array("q", rest_offsets.tobytes()),
+        )
+    is_key = [False] * len(values)
+    for offset in offsets[:-1]:
+        is_key[offset] = True
+    keys = list(itertools.compress(values, is_key))
+    rest = list(itertools.compress(values, map(operator.not_, is_key)))
+    rest_offsets = [offset - i for i, offset in enumerate(offsets)]
+    return _to_array(keys), _to_array(rest), array("q", rest_offsets)
+
+
+def iter_blocks(path: str, block_size: int = STREAM_BLOCK_SIZE) -> Generator[bytes, None, None]:
+    """Blocks of about `block_size` bytes of the file, always ending at the end of a line."""
+    with open(path, "rb") as hand:
+        rest = b""
+        while block := hand.read(block_size):
+            block = rest + block
+            end = block.rfind(b"\n") + 1
+            rest = block[end:]
+            if end > 0:
+                yield block[:end]
+        if rest:
+            yield rest
+
+
+def iter_int_rows(path: str, n: int, block_size: int = STREAM_BLOCK_SIZE) -> Generator[Tuple[int, ...], None, None]:
+    """Groups of `n` consecutive integers of the file, read one block at a time.
+
+    The groups do not have to be on a single line, records spread on several lines like
+    `Button A: X+94, Y+34` / `Button B: ...` / `Prize: ...` can be read as groups of 6.
+    """
+    carry: List[int] = []
+    for block in iter_blocks(path, block_size):
+        values = carry + list(parse_ints(block))
+        end = len(values) - len(values) % n
+        yield from zip(*[iter(values[:end])] * n)
+        carry = values[end:]
+    if len(carry) > 0:
+        raise ValueError(f"Expected groups of {n} integers in {path}, {len(carry)} integers left")
+
+
+def iter_ragged_ints(path: str, block_size: int = STREAM_BLOCK_SIZE) -> Generator[Tuple[int, ...], None, None]:
+    """Integers of each line of the file with integers, read one block at a time."""
+    for block in iter_blocks(path, block_size):
+        values, offsets = parse_ragged_ints(block)
+        values, offsets = list(values), list(offsets)
+        for start, end in zip(offsets, offsets[1:]):
+            yield tuple(values[start:end])
+
+
+def iter_key_values(
+    path: str, block_size: int = STREAM_BLOCK_SIZE
+) -> Generator[Tuple[int, Tuple[int, ...]], None, None]:
+    """Key and values of each `key: value value ...` line of the file, read one block at a time."""
+    for row in iter_ragged_ints(path, block_size):
+        yield row[0], row[1:]
@@ -0,0 +1,82 @@
+"""Persistent cache of the answers.
+
+An answer is stored in its own file, named after the hash of the day, the part, the content of the
+input, the source of the solution and the sources of the `aoc` package it builds on, so changing
+the input, the code of the day or the shared code is enough to compute the answer again. When the
+files take more than the allowed size the least recently used ones are removed.
+"""
+import hashlib
+import json
+import os
+from typing import Tuple
+
+from aoc import days, parse_cache
+
+ENV_VAR = "AOC_RESULT_CACHE"
+DEFAULT_DIR = os.path.join(days.ROOT, ".cache", "results")
+DEFAULT_MAX_SIZE = 1 << 20
+
+
+def get_cache_dir() -> str:
+    return os.environ.get(ENV_VAR, DEFAULT_DIR)
+
+
+def get_key(day: int, part: int, path: str) -> str:
+    input_hash = parse_cache.hash_file(path)
+    source_hash = parse_cache.hash_file(days.get_solution_path(day))
+    package_hash = parse_cache.hash_package()
+    return hashlib.sha256(f"{day}-{part}-{input_hash}-{source_hash}-{package_hash}".encode()).hexdigest()
+
+
+class ResultCache:
+
+    def __init__(self, directory: str | None = None, max_size: int = DEFAULT_MAX_SIZE) -> None:
+        self.directory = directory if directory is not None else get_cache_dir()
+        self.max_size = max_size
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".json")
+
+    def get(self, key: str) -> str | None:
+        path = self._get_path(key)
+        try:
+            with open(path) as hand:
+                answer = json.load(hand)["answer"]
+        except (OSError, ValueError, KeyError):
+            return None
+        # The modification time tracks the last use, for the eviction
+        os.utime(path)
+        return answer
+
+    def put(self, key: str, day: int, part: int, answer: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._get_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as hand:
+            json.dump({"day": day, "part": part, "answer": answer}, hand)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def _list(self) -> Tuple[Tuple[float, int, str], ...]:
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    # Removed by another process
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return tuple(sorted(entries))
+
+    def evict(self) -> None:
+        entries = self._list()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
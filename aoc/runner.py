@@ -0,0 +1,222 @@
+import argparse
+import concurrent.futures
+import contextlib
+import json
+import os
+import sys
+import time
+from typing import Dict, Any, List, Tuple
+
+from aoc import counters, days, parse_cache, profiling, result_cache
+
+Task = Tuple[int, int, str]
+Result = Dict[str, Any]
+
+
+def get_input_path(day: int, input_name: str) -> str:
+    if os.path.isabs(input_name):
+        return input_name
+    return os.path.join(days.get_day_dir(day), input_name)
+
+
+def run_task(
+    day: int,
+    part: int,
+    path: str,
+    use_parse_cache: bool = False,
+    profile_tools: List[str] | None = None,
+    profile_top: int = profiling.DEFAULT_TOP,
+    count: bool = False,
+    result_cache_size: int | None = None,
+    stream: bool = False,
+) -> Result:
+    result: Result = {"day": day, "part": part, "input": path}
+    profiler = profiling.Profiler(profile_tools or [], profile_top)
+    counters.enable(count)
+    counters.reset()
+    cache = None
+    try:
+        if result_cache_size is not None:
+            cache = result_cache.ResultCache(max_size=result_cache_size)
+            key = result_cache.get_key(day, part, path)
+            answer = cache.get(key)
+            if answer is not None:
+                result["answer"] = answer
+                result["result_cached"] = True
+                return result
+        module = days.load_module(day)
+        solver = module.Solver()
+        # Some solvers print debug output, keep the report readable
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            if stream and hasattr(solver, days.STREAM_PARTS[part]):
+                # The input is read while solving
+                result["streamed"] = True
+                wall, cpu = time.perf_counter(), time.process_time()
+                with profiler.phase(days.STREAM_PARTS[part]):
+                    answer = getattr(solver, days.STREAM_PARTS[part])(path)
+            else:
+                wall, cpu = time.perf_counter(), time.process_time()
+                with profiler.phase("parse"):
+                    if use_parse_cache:
+                        result["parse_cached"] = parse_cache.parse(solver, path)
+                    else:
+                        solver.parse(path)
+                result["parse_wall"] = time.perf_counter() - wall
+                result["parse_cpu"] = time.process_time() - cpu
+
+                wall, cpu = time.perf_counter(), time.process_time()
+                with profiler.phase(days.PARTS[part]):
+                    answer = getattr(solver, days.PARTS[part])()
+            result["solve_wall"] = time.perf_counter() - wall
+            result["solve_cpu"] = time.process_time() - cpu
+        result["answer"] = str(answer)
+        if cache is not None:
+            cache.put(key, day, part, result["answer"])
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    if profiler.enabled:
+        result["profile"] = profiler.records
+    if count:
+        result["counters"] = counters.snapshot()
+    return result
+
+
+def get_tasks(selected_days: List[int], parts: List[int], input_name: str) -> List[Task]:
+    tasks: List[Task] = []
+    for day in selected_days:
+        for part in days.get_parts(day):
+            if part in parts:
+                tasks.append((day, part, get_input_path(day, input_name)))
+    return tasks
+
+
+def run(tasks: List[Task], jobs: int, **options: Any) -> List[Result]:
+    results: List[Result] = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(run_task, *task, **options) for task in tasks]
+        for future in concurrent.futures.as_completed(futures):
+            results.append(future.result())
+    results.sort(key=lambda el: (el["day"], el["part"]))
+    return results
+
+
+def _format_time(seconds: float | None) -> str:
+    if seconds is None:
+        return "-"
+    return "%.3fs" % seconds
+
+
+def _format_parse_time(result: Result) -> str:
+    if result.get("streamed"):
+        return "streamed"
+    formatted = _format_time(result.get("parse_wall"))
+    if result.get("parse_cached"):
+        formatted += " (cached)"
+    return formatted
+
+
+def _format_counters(values: Dict[str, int]) -> str:
+    return " ".join(f"{name}={value}" for name, value in sorted(values.items()))
+
+
+def print_report(results: List[Result], elapsed: float) -> None:
+    header: Tuple[str, ...] = ("Day", "Part", "Answer", "Parse wall", "Parse CPU", "Solve wall", "Solve CPU")
+    with_counters = any("counters" in result for result in results)
+    if with_counters:
+        header += ("Counters",)
+    rows = [header]
+    for result in results:
+        answer = result.get("answer", result.get("error", ""))
+        if result.get("result_cached"):
+            answer += " (cached)"
+        row: Tuple[str, ...] = (
+            "%02d" % result["day"],
+            str(result["part"]),
+            answer,
+            _format_parse_time(result),
+            _format_time(result.get("parse_cpu")),
+            _format_time(result.get("solve_wall")),
+            _format_time(result.get("solve_cpu")),
+        )
+        if with_counters:
+            row += (_format_counters(result.get("counters", {})),)
+        rows.append(row)
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    for row in rows:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip())
+    total_cpu = sum(r.get("parse_cpu", 0) + r.get("solve_cpu", 0) for r in results)
+    print(f"Total: {elapsed:.3f}s wall, {total_cpu:.3f}s CPU")
+
+
+def write_profile(results: List[Result], path: str) -> None:
+    keys = ("day", "part", "input", "profile")
+    profiles = [{key: result[key] for key in keys} for result in results if "profile" in result]
+    with open(path, "w") as hand:
+        json.dump(profiles, hand, indent=2)
+    print(f"Profile written to {path}")
+
+
+def main(args: argparse.Namespace) -> None:
+    parts = [args.part] if args.part is not None else list(days.PARTS)
+    tasks = get_tasks(days.parse_days(args.days), parts, args.input)
+    try:
+        if args.profile is not None:
+            profile_tools = profiling.parse_tools(args.profile)
+        else:
+            profile_tools = profiling.get_env_tools()
+    except ValueError as e:
+        sys.exit(f"error: {e}")
+    profile_top = args.profile_top if args.profile_top is not None else profiling.get_env_top()
+    start = time.perf_counter()
+    results = run(
+        tasks,
+        jobs=args.jobs,
+        use_parse_cache=args.parse_cache,
+        profile_tools=profile_tools,
+        profile_top=profile_top,
+        count=args.counters or counters.enabled,
+        result_cache_size=args.result_cache_size if args.result_cache else None,
+        stream=args.stream,
+    )
+    print_report(results, time.perf_counter() - start)
+    if profile_tools:
+        write_profile(results, args.profile_output or profiling.get_env_output())
+
+
+def add_parser(subparsers: argparse._SubParsersAction) -> None:
+    parser = subparsers.add_parser("run", help="solve several days in parallel and report timings")
+    parser.add_argument("days", nargs="*", help="days to run, e.g. 1 5 20-25 (default: all)")
+    parser.add_argument("--part", type=int, choices=sorted(days.PARTS), help="only run this part")
+    parser.add_argument("--input", default="input", help="input file name inside each day folder")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument(
+        "--parse-cache", action="store_true", help="reuse the parsed state saved next to each input"
+    )
+    parser.add_argument(
+        "--stream", action="store_true", help="read the input while solving, for the parts that support it"
+    )
+    parser.add_argument(
+        "--result-cache",
+        action="store_true",
+        help=f"reuse the answers computed with the same input and solution (stored in ${result_cache.ENV_VAR})",
+    )
+    parser.add_argument(
+        "--result-cache-size",
+        type=int,
+        default=result_cache.DEFAULT_MAX_SIZE,
+        help="size in bytes above which the least recently used answers are dropped",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="all",
+        metavar="TOOLS",
+        help=f"profile each phase with a comma separated list of {', '.join(profiling.TOOLS)} (default: all), "
+        f"overrides ${profiling.ENV_VAR}",
+    )
+    parser.add_argument(
+        "--counters", action="store_true", help=f"report the work counters of the solvers (or set ${counters.ENV_VAR})"
+    )
+    parser.add_argument("--profile-top", type=int, help="number of hot functions reported per phase")
+    parser.add_argument("--profile-output", help=f"JSON file for the profile (default: {profiling.DEFAULT_OUTPUT})")
+    parser.set_defaults(func=main)
@@ -0,0 +1,277 @@
+"""Shortest path searches over integer states, such as the flat indices of a `Grid`.
+
+The searches keep their results in flat arrays indexed by state instead of dicts of points: the
+distance of every state from the nearest source, and on request the predecessor of each state on
+one of its shortest paths and the number of shortest paths reaching it. States that were not
+reached have the distance `UNREACHED`.
+
+`grid_bfs` walks the cells of a grid whose values are in a given set, `bfs` and `dijkstra` walk
+any graph whose states are the integers `0 .. n_states - 1`, given the neighbours of each state:
+
+    field = search.grid_bfs(grid, [start], [ord(".")], target=end)
+    field[end], field.path_to(end)
+
+With a `target` the search stops as soon as the distance of the target is known, the distances of
+the states further than the target are then not final.
+"""
+import collections
+import heapq
+from array import array
+from typing import Callable, Iterable, List, Tuple
+
+from aoc import counters
+from aoc.grid import BORDER, Grid
+
+UNREACHED = -1
+NO_PREDECESSOR = -1
+
+State = int
+Neighbours = Callable[[State], Iterable[State]]
+WeightedNeighbours = Callable[[State], Iterable[Tuple[State, int]]]
+
+
+class DistanceField:
+    __slots__ = ("distances", "predecessors", "paths")
+
+    def __init__(self, n_states: int, predecessors: bool = False, count_paths: bool = False) -> None:
+        self.distances = array("q", [UNREACHED]) * n_states
+        self.predecessors = array("q", [NO_PREDECESSOR]) * n_states if predecessors else None
+        # The counts grow exponentially with the distance on open grids, they do not fit in an array
+        self.paths: List[int] | None = [0] * n_states if count_paths else None
+
+    def __len__(self) -> int:
+        return len(self.distances)
+
+    def __getitem__(self, state: State) -> int:
+        return self.distances[state]
+
+    def reached(self, state: State) -> bool:
+        return self.distances[state] != UNREACHED
+
+    def path_to(self, state: State) -> List[State]:
+        """States of a shortest path from a source to the state, both included."""
+        if self.predecessors is None:
+            raise ValueError("The predecessors were not kept, search with predecessors=True")
+        if not self.reached(state):
+            raise ValueError(f"State {state} was not reached")
+        path = [state]
+        while (state := self.predecessors[state]) != NO_PREDECESSOR:
+            path.append(state)
+        path.reverse()
+        return path
+
+    def count_paths(self, state: State) -> int:
+        if self.paths is None:
+            raise ValueError("The paths were not counted, search with count_paths=True")
+        return self.paths[state]
+
+
+def _start(field: DistanceField, sources: Iterable[State]) -> List[State]:
+    starts = []
+    for source in sources:
+        if field.distances[source] == UNREACHED:
+            field.distances[source] = 0
+            starts.append(source)
+            if field.paths is not None:
+                field.paths[source] = 1
+    return starts
+
+
+def _bfs(field: DistanceField, sources: Iterable[State], neighbours: Neighbours, target: State | None) -> None:
+    distances, predecessors, paths = field.distances, field.predecessors, field.paths
+    queue = collections.deque(_start(field, sources))
+    popped = 0
+    while queue:
+        state = queue.popleft()
+        popped += 1
+        if state == target:
+            break
+        distance = distances[state] + 1
+        for neighbour in neighbours(state):
+            if distances[neighbour] == UNREACHED:
+                distances[neighbour] = distance
+                queue.append(neighbour)
+                if predecessors is not None:
+                    predecessors[neighbour] = state
+                if paths is not None:
+                    paths[neighbour] = paths[state]
+            elif paths is not None and distances[neighbour] == distance:
+                paths[neighbour] += paths[state]
+    if counters.enabled:
+        counters.add("states_popped", popped)
+
+
+def bfs(
+    n_states: int,
+    sources: Iterable[State],
+    neighbours: Neighbours,
+    target: State | None = None,
+    predecessors: bool = False,
+    count_paths: bool = False,
+) -> DistanceField:
+    """Breadth first search from all the sources at once, every move costs 1."""
+    field = DistanceField(n_states, predecessors=predecessors, count_paths=count_paths)
+    _bfs(field, sources, neighbours, target)
+    return field
+
+
+def grid_bfs(
+    grid: Grid,
+    sources: Iterable[int],
+    passable: Iterable[int],
+    target: int | None = None,
+    predecessors: bool = False,
+    count_paths: bool = False,
+) -> DistanceField:
+    """Breadth first search over the cells of the grid holding one of the `passable` values."""
+    allowed = bytearray(256)
+    for value in passable:
+        allowed[value] = 1
+    # The border is never passable, so the neighbours of a reached cell are always in the grid
+    allowed[BORDER] = 0
+    is_open = grid.data.translate(allowed)
+    if predecessors or count_paths:
+        steps = grid.directions
+
+        def neighbours(cell: int) -> Iterable[int]:
+            return [cell + step for step in steps if is_open[cell + step]]
+
+        return bfs(len(grid), sources, neighbours, target, predecessors=predecessors, count_paths=count_paths)
+    # With the distances only the cells are walked one level at a time, all the cells of a level share
+    # their distance and a cell is closed as soon as it is reached
+    field = DistanceField(len(grid))
+    distances = field.distances
+    up, right, down, left = grid.directions
+    # Cells that can still be reached, the search's own copy of the grid
+    unvisited = is_open
+    border = _start(field, sources)
+    for cell in border:
+        unvisited[cell] = 0
+    distance = 0
+    popped = 0
+    while border:
+        if target is not None and distances[target] != UNREACHED:
+            break
+        popped += len(border)
+        distance += 1
+        new_border: List[int] = []
+        append = new_border.append
+        for cell in border:
+            # Unrolled, this runs for every cell of the grid
+            neighbour = cell + up
+            if unvisited[neighbour]:
+                unvisited[neighbour] = 0
+                distances[neighbour] = distance
+                append(neighbour)
+            neighbour = cell + right
+            if unvisited[neighbour]:
+                unvisited[neighbour] = 0
+                distances[neighbour] = distance
+                append(neighbour)
+            neighbour = cell + down
+            if unvisited[neighbour]:
+                unvisited[neighbour] = 0
+                distances[neighbour] = distance
+                append(neighbour)
+            neighbour = cell + left
+            if unvisited[neighbour]:
+                unvisited[neighbour] = 0
+                distances[neighbour] = distance
+                append(neighbour)
+        border = new_border
+    if counters.enabled:
+        counters.add("states_popped", popped)
+    return field
+
+
+def dijkstra(
+    n_states: int,
+    sources: Iterable[State],
+    neighbours: WeightedNeighbours,
+    target: State | None = None,
+    predecessors: bool = False,
+    max_cost: int | None = None,
+) -> DistanceField:
+    """Cheapest paths from all the sources at once, the neighbours come with the non negative integer cost of the move.
+
+    When all the costs are integers of at most `max_cost` the states wait in a ring of `max_cost + 1`
+    buckets, one per distance, instead of a heap.
+    """
+    field = DistanceField(n_states, predecessors=predecessors)
+    starts = _start(field, sources)
+    if max_cost is None:
+        _dijkstra_heap(field, starts, neighbours, target)
+    else:
+        _dijkstra_buckets(field, starts, neighbours, target, max_cost)
+    return field
+
+
+def _dijkstra_heap(
+    field: DistanceField, starts: List[State], neighbours: WeightedNeighbours, target: State | None
+) -> None:
+    distances, predecessors = field.distances, field.predecessors
+    n_states = len(distances)
+    done = bytearray(n_states)
+    # Distance and state packed in a single integer, which orders like the (distance, state) tuple
+    # without allocating one for every push
+    border = list(starts)
+    heapq.heapify(border)
+    popped = 0
+    while border:
+        distance, state = divmod(heapq.heappop(border), n_states)
+        if done[state]:
+            continue
+        done[state] = 1
+        popped += 1
+        if state == target:
+            break
+        for neighbour, cost in neighbours(state):
+            new_distance = distance + cost
+            current = distances[neighbour]
+            if current == UNREACHED or new_distance < current:
+                distances[neighbour] = new_distance
+                heapq.heappush(border, new_distance * n_states + neighbour)
+                if predecessors is not None:
+                    predecessors[neighbour] = state
+    if counters.enabled:
+        counters.add("states_popped", popped)
+
+
+def _dijkstra_buckets(
+    field: DistanceField, starts: List[State], neighbours: WeightedNeighbours, target: State | None, max_cost: int
+) -> None:
+    distances, predecessors = field.distances, field.predecessors
+    done = bytearray(len(distances))
+    n_buckets = max_cost + 1
+    buckets: List[List[State]] = [[] for _ in range(n_buckets)]
+    buckets[0].extend(starts)
+    pending = len(starts)
+    distance = 0
+    popped = 0
+    while pending > 0:
+        bucket = buckets[distance % n_buckets]
+        # States reached at the current distance are appended to the bucket while it is emptied
+        while bucket:
+            state = bucket.pop()
+            pending -= 1
+            if done[state] or distances[state] != distance:
+                continue
+            done[state] = 1
+            popped += 1
+            if state == target:
+                pending = 0
+                break
+            for neighbour, cost in neighbours(state):
+                new_distance = distance + cost
+                current = distances[neighbour]
+                if current == UNREACHED or new_distance < current:
+                    if cost > max_cost:
+                        raise ValueError(f"Move of cost {cost} from {state}, above max_cost={max_cost}")
+                    distances[neighbour] = new_distance
+                    buckets[new_distance % n_buckets].append(neighbour)
+                    pending += 1
+                    if predecessors is not None:
+                        predecessors[neighbour] = state
+        distance += 1
+    if counters.enabled:
+        counters.add("states_popped", popped)
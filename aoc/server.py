@@ -0,0 +1,164 @@
+"""Long running solver, answering requests without paying the start up of Python every time.
+
+Requests and responses are JSON objects, one per line, read from the standard input or from the
+connections to a Unix socket:
+
+    {"id": 1, "day": 6, "part": 2, "input": "....#.....\\n..."}
+    {"id": 1, "answer": "6", "cached": false, "time": 0.0123}
+
+Every day is imported once at start up. The parsed state of recent inputs, keyed by the hash of the
+input, and the recent answers are kept in memory, so repeated inputs skip the parsing and repeated
+questions are answered from memory. Each connection to the socket is served by its own thread, so
+a client keeping its connection open does not hold up the others.
+"""
+import argparse
+import collections
+import contextlib
+import hashlib
+import io
+import json
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, Any, Tuple, TextIO
+
+from aoc import days, parse_cache
+
+Request = Dict[str, Any]
+Response = Dict[str, Any]
+
+
+class LRUCache:
+    """Least recently used values, shared by the threads serving the connections."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.values: collections.OrderedDict = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: Any) -> Any:
+        with self.lock:
+            value = self.values.get(key)
+            if value is not None:
+                self.values.move_to_end(key)
+            return value
+
+    def put(self, key: Any, value: Any) -> None:
+        with self.lock:
+            self.values[key] = value
+            self.values.move_to_end(key)
+            while len(self.values) > self.size:
+                self.values.popitem(last=False)
+
+
+class Server:
+
+    def __init__(self, max_states: int, max_answers: int) -> None:
+        self.modules = {day: days.load_module(day) for day in days.list_days()}
+        self.states = LRUCache(max_states)
+        self.answers = LRUCache(max_answers)
+
+    def _parse(self, day: int, data: bytes) -> Any:
+        solver = self.modules[day].Solver()
+        with tempfile.NamedTemporaryFile(suffix=".input") as hand:
+            hand.write(data)
+            hand.flush()
+            solver.parse(hand.name)
+        return solver
+
+    def _get_solver(self, day: int, data: bytes, digest: str) -> Any:
+        # The state is stored serialized: solving may modify the solver and the next request needs
+        # the state as it was just after parsing
+        state = self.states.get((day, digest))
+        if state is not None:
+            solver = self.modules[day].Solver()
+            parse_cache.load_state(solver, state)
+            return solver
+        solver = self._parse(day, data)
+        state = parse_cache.dump_state(solver)
+        if state is not None:
+            self.states.put((day, digest), state)
+        return solver
+
+    def solve(self, day: int, part: int, data: bytes) -> Tuple[str, bool]:
+        """Answer of the part for the input, and whether it was already known."""
+        if day not in self.modules:
+            raise ValueError(f"Unknown day {day}")
+        if part not in days.PARTS:
+            raise ValueError(f"Unknown part {part}")
+        digest = hashlib.sha256(data).hexdigest()
+        answer = self.answers.get((day, part, digest))
+        if answer is not None:
+            return answer, True
+        solver = self._get_solver(day, data, digest)
+        answer = str(getattr(solver, days.PARTS[part])())
+        self.answers.put((day, part, digest), answer)
+        return answer, False
+
+    def handle(self, request: Request) -> Response:
+        response: Response = {"id": request.get("id")}
+        start = time.perf_counter()
+        try:
+            answer, cached = self.solve(int(request["day"]), int(request["part"]), request["input"].encode())
+            response["answer"] = answer
+            response["cached"] = cached
+        except Exception as e:
+            response["error"] = f"{type(e).__name__}: {e}"
+        response["time"] = time.perf_counter() - start
+        return response
+
+    def serve(self, infile: TextIO, outfile: TextIO) -> None:
+        for line in infile:
+            if line.strip() == "":
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                response: Response = {"id": None, "error": f"Invalid request: {e}"}
+            else:
+                response = self.handle(request)
+            outfile.write(json.dumps(response) + "\n")
+            outfile.flush()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def handle(self) -> None:
+        infile = io.TextIOWrapper(self.rfile, encoding="utf-8")
+        outfile = io.TextIOWrapper(self.wfile, encoding="utf-8")
+        self.server.solver.serve(infile, outfile)
+
+
+def main(args: argparse.Namespace) -> None:
+    # Keep the standard output for the responses, the debug output of the solvers is dropped
+    responses = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    with open(os.devnull, "w") as devnull:
+        os.dup2(devnull.fileno(), sys.stdout.fileno())
+    server = Server(max_states=args.max_states, max_answers=args.max_answers)
+    if args.socket is None:
+        server.serve(sys.stdin, responses)
+        return
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(args.socket)
+    with socketserver.ThreadingUnixStreamServer(args.socket, _Handler) as unix_server:
+        # Open connections do not keep the server running once it is interrupted
+        unix_server.daemon_threads = True
+        unix_server.solver = server
+        print(f"Listening on {args.socket}", file=sys.stderr)
+        try:
+            unix_server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(args.socket)
+
+
+def add_parser(subparsers: argparse._SubParsersAction) -> None:
+    parser = subparsers.add_parser("serve", help="answer JSON requests with warm solvers")
+    parser.add_argument("--socket", help="listen on this Unix socket instead of the standard input")
+    parser.add_argument("--max-states", type=int, default=64, help="number of parsed inputs kept in memory")
+    parser.add_argument("--max-answers", type=int, default=4096, help="number of answers kept in memory")
+    parser.set_defaults(func=main)
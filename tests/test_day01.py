@@ -0,0 +1,68 @@
+import collections
+import os
+import random
+import sys
+import unittest
+import unittest.mock
+from typing import List, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aoc import days
+
+day01 = days.load_module(1)
+
+
+def get_scores(pairs: List[Tuple[int, int]]) -> Tuple[int, int]:
+    left_list = sorted(left for left, _ in pairs)
+    right_list = sorted(right for _, right in pairs)
+    right_counts = collections.Counter(right_list)
+    distance = sum(abs(left - right) for left, right in zip(left_list, right_list))
+    return distance, sum(left * right_counts[left] for left in left_list)
+
+
+class LocationTrackerTest(unittest.TestCase):
+
+    def check(self, seed: int) -> None:
+        rng = random.Random(seed)
+        top = rng.randint(1, 40)
+        pairs = [(rng.randint(-5, top), rng.randint(-5, top)) for _ in range(rng.randint(0, 30))]
+        tracker = day01.LocationTracker.from_pairs([left for left, _ in pairs], [right for _, right in pairs])
+        self.assertEqual((tracker.distance, tracker.similarity), get_scores(pairs))
+        for _ in range(80):
+            if pairs and rng.random() < 0.45:
+                left = rng.choice(pairs)[0]
+                right = rng.choice(pairs)[1]
+                tracker.remove_pair(left, right)
+                left_list = [value for value, _ in pairs]
+                right_list = [value for _, value in pairs]
+                left_list.remove(left)
+                right_list.remove(right)
+                pairs = list(zip(left_list, right_list))
+            else:
+                pair = (rng.randint(-10, top + 5), rng.randint(-10, top + 5))
+                tracker.add_pair(*pair)
+                pairs.append(pair)
+            self.assertEqual((tracker.distance, tracker.similarity), get_scores(pairs))
+            self.assertEqual(len(tracker), len(pairs))
+
+    def test_random_updates(self) -> None:
+        # Tiny blocks so that the splits and the cuts of the domain happen all the time
+        for min_block_size in (1, 2, 3, day01.MIN_BLOCK_SIZE):
+            with unittest.mock.patch.object(day01, "MIN_BLOCK_SIZE", min_block_size):
+                for seed in range(200):
+                    with self.subTest(min_block_size=min_block_size, seed=seed):
+                        self.check(seed)
+
+    def test_remove_missing_pair(self) -> None:
+        tracker = day01.LocationTracker.from_pairs([1, 2], [3, 4])
+        with self.assertRaises(KeyError):
+            tracker.remove_pair(3, 3)
+
+    def test_lists_of_different_lengths(self) -> None:
+        with self.assertRaises(ValueError):
+            day01.LocationTracker.from_pairs([1, 2], [3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import random
+import sys
+import tempfile
+import unittest
+import unittest.mock
+from typing import List
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aoc import days, reader
+
+day02 = days.load_module(2)
+
+
+def is_safe(report: List[int]) -> bool:
+    steps = [b - a for a, b in zip(report, report[1:])]
+    return all(1 <= step <= 3 for step in steps) or all(-3 <= step <= -1 for step in steps)
+
+
+def is_safe_with_dampener(report: List[int]) -> bool:
+    return any(is_safe(report[:i] + report[i + 1 :]) for i in range(len(report))) or is_safe(report)
+
+
+class SafeReportsTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        handle, self.path = tempfile.mkstemp(suffix=".input")
+        os.close(handle)
+
+    def tearDown(self) -> None:
+        os.remove(self.path)
+
+    def write(self, reports: List[List[int]]) -> None:
+        with open(self.path, "w") as hand:
+            for report in reports:
+                hand.write(" ".join(map(str, report)) + "\n")
+
+    def get_answers(self) -> List[int]:
+        """Answers of both parts when parsed without and with NumPy, then streamed."""
+        answers = []
+        for numpy_min_size in (reader.NUMPY_MIN_SIZE, 0):
+            with unittest.mock.patch.object(reader, "NUMPY_MIN_SIZE", numpy_min_size):
+                solver = day02.Solver()
+                solver.parse(self.path)
+                answers.append(solver.solve1())
+                answers.append(solver.solve2())
+        solver = day02.Solver()
+        answers.append(solver.stream1(self.path))
+        answers.append(solver.stream2(self.path))
+        return answers
+
+    def test_single_level(self) -> None:
+        self.write([[5], [1, 2, 3], [1, 9], [7]])
+        self.assertEqual(self.get_answers(), [3, 4] * 3)
+
+    def test_random_reports(self) -> None:
+        rng = random.Random(0)
+        reports = []
+        for _ in range(2000):
+            report = [rng.randint(1, 20)]
+            for _ in range(rng.randint(0, 7)):
+                report.append(report[-1] + rng.choice((-5, -3, -2, -1, 0, 1, 2, 3, 5)))
+            reports.append(report)
+        self.write(reports)
+        safe = sum(map(is_safe, reports))
+        safe_with_dampener = sum(map(is_safe_with_dampener, reports))
+        self.assertEqual(self.get_answers(), [safe, safe_with_dampener] * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()